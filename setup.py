@@ -21,22 +21,25 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
     install_requires=[
-        "fastapi>=0.68.0",
+        "fastapi>=0.100.0",
         "uvicorn>=0.15.0",
         "sqlalchemy>=1.4.23",
-        "pydantic>=1.8.2",
-        "passlib>=1.7.4",
-        "python-jose>=3.3.0",
+        "pydantic>=2.0",
+        "bcrypt>=4.0.0",
+        "argon2-cffi>=23.1.0",
+        "PyJWT[crypto]>=2.8.0",
         "python-multipart>=0.0.5",
         "asyncpg>=0.24.0",
-        "redis>=4.0.2",
+        "redis>=4.2.0",
         "alembic>=1.7.3",
         "inquirer>=2.7.0",
-        "inflect>=5.3.0",
         "typer>=0.4.0",
         "colorama>=0.4.4",
+        "cachetools>=5.3.0",
+        "orjson>=3.8.0",
+        "Jinja2>=3.0.0",
         "aiokafka>=0.7.2",
         "aio-pika>=8.0.0",
         "websockets>=10.0",
@@ -1,10 +1,12 @@
 """
 Application use cases for authentication.
 """
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
 import uuid
 
-from src.domain.entities import User, Role, Privilege
+from src.domain.entities import User, Role, Privilege, UserRole, RolePrivilege
+from src.domain.exceptions import UserNotFound, RoleNotFound, PrivilegeNotFound
 from src.domain.repositories.auth import UserRepository, RoleRepository, PrivilegeRepository
 from src.domain.services.auth import PasswordService, TokenService, AuthService
 
@@ -29,18 +31,8 @@ class RegisterUserUseCase:
         is_superuser: bool = False,
     ) -> User:
         """Register a new user."""
-        # Check if username already exists
-        existing_user = await self.user_repository.get_by_username(username)
-        if existing_user:
-            raise ValueError(f"Username '{username}' already exists")
-        
-        # Check if email already exists
-        existing_user = await self.user_repository.get_by_email(email)
-        if existing_user:
-            raise ValueError(f"Email '{email}' already exists")
-        
-        # Hash password
-        hashed_password = self.password_service.hash_password(password)
+        # Hash password off the event loop; password hashing is deliberately slow
+        hashed_password = await asyncio.to_thread(self.password_service.hash_password, password)
         
         # Create user entity
         user = User(
@@ -52,8 +44,34 @@ class RegisterUserUseCase:
             is_superuser=is_superuser,
         )
         
-        # Save user to repository
+        # Save user to repository; raises ValueError if username or email exist
         return await self.user_repository.create(user)
+    
+    async def execute_many(self, items: List[Dict[str, Any]]) -> List[User]:
+        """Register multiple users in a single batch.
+        
+        Each item takes the same keyword arguments as execute().
+        """
+        # Hash all passwords concurrently off the event loop
+        hashed_passwords = await asyncio.gather(*[
+            asyncio.to_thread(self.password_service.hash_password, item["password"])
+            for item in items
+        ])
+        
+        users = [
+            User(
+                username=item["username"],
+                email=item["email"],
+                hashed_password=hashed_password,
+                full_name=item.get("full_name"),
+                is_active=item.get("is_active", True),
+                is_superuser=item.get("is_superuser", False),
+            )
+            for item, hashed_password in zip(items, hashed_passwords)
+        ]
+        
+        # Save all users in one batch
+        return await self.user_repository.create_many(users)
 
 
 class LoginUserUseCase:
@@ -79,21 +97,20 @@ class LoginUserUseCase:
             return None
         
         # Generate tokens
-        access_token = self.token_service.create_access_token({"sub": str(user.id)})
-        refresh_token = self.token_service.create_refresh_token({"sub": str(user.id)})
+        access_token, refresh_token = self.token_service.create_access_and_refresh(user.id_str)
         
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer",
             "user": {
-                "id": str(user.id),
+                "id": user.id_str,
                 "username": user.username,
                 "email": user.email,
                 "full_name": user.full_name,
                 "is_active": user.is_active,
                 "is_superuser": user.is_superuser,
-                "roles": [{"id": str(role.id), "name": role.name} for role in user.roles],
+                "roles": [{"id": role.id_str, "name": role.name} for role in user.roles],
             },
         }
 
@@ -114,19 +131,15 @@ class RefreshTokenUseCase:
         refresh_token: str,
     ) -> Optional[Dict[str, Any]]:
         """Refresh an access token."""
-        # Verify refresh token
+        # Verify refresh token; the token service reuses payloads it already verified
         payload = self.token_service.verify_token(refresh_token)
-        if not payload or payload.get("type") != "refresh":
-            return None
         
-        # Get user ID from token
-        user_id_str = payload.get("sub")
-        if not user_id_str:
+        if not payload or payload.get("type") != "refresh":
             return None
         
-        try:
-            user_id = uuid.UUID(user_id_str)
-        except ValueError:
+        # Get user ID from token; verify_token already parsed it to a UUID
+        user_id = payload.get("sub")
+        if not user_id:
             return None
         
         # Get user from repository
@@ -135,7 +148,7 @@ class RefreshTokenUseCase:
             return None
         
         # Generate new access token
-        access_token = self.token_service.create_access_token({"sub": str(user.id)})
+        access_token = self.token_service.create_access_token(user.id_str)
         
         return {
             "access_token": access_token,
@@ -175,18 +188,13 @@ class CreateRoleUseCase:
         description: Optional[str] = None,
     ) -> Role:
         """Create a new role."""
-        # Check if role already exists
-        existing_role = await self.role_repository.get_by_name(name)
-        if existing_role:
-            raise ValueError(f"Role '{name}' already exists")
-        
         # Create role entity
         role = Role(
             name=name,
             description=description,
         )
         
-        # Save role to repository
+        # Save role to repository; raises ValueError if the name exists
         return await self.role_repository.create(role)
 
 
@@ -205,18 +213,13 @@ class CreatePrivilegeUseCase:
         description: Optional[str] = None,
     ) -> Privilege:
         """Create a new privilege."""
-        # Check if privilege already exists
-        existing_privilege = await self.privilege_repository.get_by_name(name)
-        if existing_privilege:
-            raise ValueError(f"Privilege '{name}' already exists")
-        
         # Create privilege entity
         privilege = Privilege(
             name=name,
             description=description,
         )
         
-        # Save privilege to repository
+        # Save privilege to repository; raises ValueError if the name exists
         return await self.privilege_repository.create(privilege)
 
 
@@ -227,9 +230,11 @@ class AssignRoleToUserUseCase:
         self,
         user_repository: UserRepository,
         role_repository: RoleRepository,
+        auth_service: AuthService,
     ):
         self.user_repository = user_repository
         self.role_repository = role_repository
+        self.auth_service = auth_service
     
     async def execute(
         self,
@@ -237,25 +242,30 @@ class AssignRoleToUserUseCase:
         role_id: uuid.UUID,
     ) -> User:
         """Assign a role to a user."""
-        # Check if user exists
-        user = await self.user_repository.get_by_id(user_id)
+        # Check if user and role exist
+        user, role = await asyncio.gather(
+            self.user_repository.get_by_id(user_id),
+            self.role_repository.get_by_id(role_id),
+        )
         if not user:
-            raise ValueError(f"User with ID {user_id} not found")
-        
-        # Check if role exists
-        role = await self.role_repository.get_by_id(role_id)
+            raise UserNotFound(user_id)
         if not role:
-            raise ValueError(f"Role with ID {role_id} not found")
-        
-        # Add role to user
-        await self.user_repository.add_role(user_id, role_id)
-        
-        # Get updated user
-        updated_user = await self.user_repository.get_by_id(user_id)
-        if not updated_user:
-            raise ValueError(f"User with ID {user_id} not found after update")
+            raise RoleNotFound(role_id)
         
-        return updated_user
+        # Add role to user and return the updated user
+        updated = await self.user_repository.add_role(user_id, role_id)
+        await self.auth_service.invalidate_user(user_id)
+        return updated
+    
+    async def execute_many(
+        self,
+        pairs: List[Tuple[uuid.UUID, uuid.UUID]],
+    ) -> List[UserRole]:
+        """Assign roles to users in a single batch of (user_id, role_id) pairs."""
+        user_roles = await self.user_repository.add_roles_bulk(pairs)
+        for user_id in {user_id for user_id, _ in pairs}:
+            await self.auth_service.invalidate_user(user_id)
+        return user_roles
 
 
 class AssignPrivilegeToRoleUseCase:
@@ -265,9 +275,11 @@ class AssignPrivilegeToRoleUseCase:
         self,
         role_repository: RoleRepository,
         privilege_repository: PrivilegeRepository,
+        auth_service: AuthService,
     ):
         self.role_repository = role_repository
         self.privilege_repository = privilege_repository
+        self.auth_service = auth_service
     
     async def execute(
         self,
@@ -275,25 +287,30 @@ class AssignPrivilegeToRoleUseCase:
         privilege_id: uuid.UUID,
     ) -> Role:
         """Assign a privilege to a role."""
-        # Check if role exists
-        role = await self.role_repository.get_by_id(role_id)
+        # Check if role and privilege exist
+        role, privilege = await asyncio.gather(
+            self.role_repository.get_by_id(role_id),
+            self.privilege_repository.get_by_id(privilege_id),
+        )
         if not role:
-            raise ValueError(f"Role with ID {role_id} not found")
-        
-        # Check if privilege exists
-        privilege = await self.privilege_repository.get_by_id(privilege_id)
+            raise RoleNotFound(role_id)
         if not privilege:
-            raise ValueError(f"Privilege with ID {privilege_id} not found")
-        
-        # Add privilege to role
-        await self.role_repository.add_privilege(role_id, privilege_id)
+            raise PrivilegeNotFound(privilege_id)
         
-        # Get updated role
-        updated_role = await self.role_repository.get_by_id(role_id)
-        if not updated_role:
-            raise ValueError(f"Role with ID {role_id} not found after update")
-        
-        return updated_role
+        # Add privilege to role and return the updated role
+        updated = await self.role_repository.add_privilege(role_id, privilege_id)
+        await self.auth_service.invalidate_role(role_id)
+        return updated
+    
+    async def execute_many(
+        self,
+        pairs: List[Tuple[uuid.UUID, uuid.UUID]],
+    ) -> List[RolePrivilege]:
+        """Assign privileges to roles in a single batch of (role_id, privilege_id) pairs."""
+        role_privileges = await self.role_repository.add_privileges_bulk(pairs)
+        for role_id in {role_id for role_id, _ in pairs}:
+            await self.auth_service.invalidate_role(role_id)
+        return role_privileges
 
 
 class CheckUserPrivilegeUseCase:
@@ -0,0 +1,62 @@
+"""
+Helpers shared by the model and CRUD code generators.
+"""
+from typing import Dict, Any, Optional
+from functools import lru_cache
+import json
+import re
+
+# English plurals for lowercase identifiers; rules are tried in order and the first match wins
+_IRREGULAR_PLURALS = {
+    "person": "people",
+    "man": "men",
+    "woman": "women",
+    "child": "children",
+    "mouse": "mice",
+    "goose": "geese",
+    "foot": "feet",
+    "tooth": "teeth",
+    "leaf": "leaves",
+    "quiz": "quizzes",
+    "hero": "heroes",
+    "potato": "potatoes",
+    "tomato": "tomatoes",
+    "datum": "data",
+    "criterion": "criteria",
+    "sheep": "sheep",
+    "fish": "fish",
+    "series": "series",
+    "species": "species",
+    "news": "news",
+}
+
+_PLURAL_RULES = [
+    (re.compile(r"(?<=[^aeiou])y$"), "ies"),
+    (re.compile(r"sis$"), "ses"),
+    (re.compile(r"(?<=[lr])f$"), "ves"),
+    (re.compile(r"(?<=i)fe$"), "ves"),
+    (re.compile(r"(s|x|z|ch|sh)$"), r"\1es"),
+]
+
+@lru_cache(maxsize=1024)
+def plural(word: str) -> str:
+    """Pluralize a lowercase identifier such as a model or table name."""
+    # Only the last word of a snake_case name is inflected
+    head, sep, last = word.rpartition("_")
+    irregular = _IRREGULAR_PLURALS.get(last)
+    if irregular:
+        return head + sep + irregular
+    
+    for pattern, replacement in _PLURAL_RULES:
+        result, count = pattern.subn(replacement, word)
+        if count:
+            return result
+    return word + "s"
+
+def read_codegen_hash(hash_path: str) -> Optional[Dict[str, Any]]:
+    """Read the hash and file list recorded by the last generation, if any."""
+    try:
+        with open(hash_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
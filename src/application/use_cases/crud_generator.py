@@ -1,57 +1,33 @@
 """
 CRUD generator with role-based access control.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import io
+import json
 import os
-import re
-import inflect
+import py_compile
+import jinja2
 
+from src.application.use_cases.codegen_utils import plural, read_codegen_hash
 from src.application.use_cases.model_generator import ModelField, ModelRelationship, Model, ModelGenerator
 
-# Initialize inflect engine for pluralization
-p = inflect.engine()
+@lru_cache(maxsize=1024)
+def _lower(name: str) -> str:
+    """Lowercase a model name."""
+    return name.lower()
 
-class CRUDGenerator:
-    """Generator for creating CRUD operations with role-based access control."""
-    
-    def __init__(self, output_dir: str):
-        self.output_dir = output_dir
-        self.model_generator = ModelGenerator(output_dir)
-    
-    def generate_privilege_seeds(self, models: List[Model], output_dir: Optional[str] = None) -> str:
-        """Generate privilege seed data for all models."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "privileges.py")
-        
-        privileges = []
-        
-        # Add standard CRUD privileges for each model
-        for model in models:
-            model_name = model.name.lower()
-            privileges.extend([
-                f'    # {model.name} privileges',
-                f'    Privilege(name="create_{model_name}", description="Can create {model_name}"),',
-                f'    Privilege(name="read_{model_name}", description="Can read {model_name}"),',
-                f'    Privilege(name="update_{model_name}", description="Can update {model_name}"),',
-                f'    Privilege(name="delete_{model_name}", description="Can delete {model_name}"),',
-            ])
-            
-            # Add relationship privileges
-            for relationship in model.relationships:
-                if relationship.type_name in ["one_to_many", "many_to_many"]:
-                    rel_name = relationship.relationship_name
-                    target_name = relationship.target_model.lower()
-                    privileges.extend([
-                        f'    Privilege(name="add_{target_name}_to_{model_name}", description="Can add {target_name} to {model_name}"),',
-                        f'    Privilege(name="remove_{target_name}_from_{model_name}", description="Can remove {target_name} from {model_name}"),',
-                    ])
-        
-        content = f"""\"\"\"
+# Relationship types that hold a collection of the target model
+_COLLECTION_TYPES = frozenset({"one_to_many", "many_to_many"})
+
+# A single environment for the process; recreating it would discard compiled templates
+_env = jinja2.Environment(trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True, cache_size=400)
+
+_PRIVILEGES_SRC = '''"""
 Privilege seed data for the application.
-\"\"\"
+"""
 from src.domain.entities import Privilege
 
 # Define privileges
@@ -61,34 +37,95 @@ privileges = [
     Privilege(name="manage_roles", description="Can manage roles"),
     Privilege(name="manage_privileges", description="Can manage privileges"),
     
-{os.linesep.join(privileges)}
+{% for model in models %}
+{% set model_name = names[model.name][0] %}
+    # {{ model.name }} privileges
+    Privilege(name="create_{{ model_name }}", description="Can create {{ model_name }}"),
+    Privilege(name="read_{{ model_name }}", description="Can read {{ model_name }}"),
+    Privilege(name="update_{{ model_name }}", description="Can update {{ model_name }}"),
+    Privilege(name="delete_{{ model_name }}", description="Can delete {{ model_name }}"),
+{% for relationship in collection_rels[model.name] %}
+{% set target_name = relationship.target_model.lower() %}
+    Privilege(name="add_{{ target_name }}_to_{{ model_name }}", description="Can add {{ target_name }} to {{ model_name }}"),
+    Privilege(name="remove_{{ target_name }}_from_{{ model_name }}", description="Can remove {{ target_name }} from {{ model_name }}"),
+{% endfor %}
+{% endfor %}
 ]
 
 def seed_privileges(privilege_repository):
-    \"\"\"Seed privileges into the database.\"\"\"
+    """Seed privileges into the database."""
     for privilege in privileges:
         try:
             existing = privilege_repository.get_by_name(privilege.name)
             if not existing:
                 privilege_repository.create(privilege)
         except Exception as e:
-            print(f"Error seeding privilege {{privilege.name}}: {{e}}")
+            print(f"Error seeding privilege {privilege.name}: {e}")
+'''
+
+_ROLE_PRIVILEGES_SRC = '''"""
+Role-privilege association seed data for the application.
 """
-        
-        with open(file_path, "w") as f:
-            f.write(content)
-        
-        return file_path
-    
-    def generate_role_seeds(self, output_dir: Optional[str] = None) -> str:
-        """Generate role seed data."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "roles.py")
-        
-        content = """\"\"\"
+
+def seed_role_privileges(role_repository, privilege_repository):
+    """Seed role-privilege associations into the database."""
+    # Admin gets all privileges
+    admin_role = role_repository.get_by_name('admin')
+    if admin_role:
+        for privilege in privilege_repository.list(limit=1000):
+            try:
+                role_repository.add_privilege(admin_role.id, privilege.id)
+            except Exception as e:
+                print(f"Error assigning privilege {privilege.name} to admin: {e}")
+
+    # Manager privileges
+    manager_role = role_repository.get_by_name('manager')
+    if manager_role:
+{% for model in models %}
+{% set model_name = names[model.name][0] %}
+        # {{ model.name }} privileges for manager
+        for privilege_name in ['create_{{ model_name }}', 'read_{{ model_name }}', 'update_{{ model_name }}', 'delete_{{ model_name }}']:
+            privilege = privilege_repository.get_by_name(privilege_name)
+            if privilege:
+                try:
+                    role_repository.add_privilege(manager_role.id, privilege.id)
+                except Exception as e:
+                    print(f"Error assigning {privilege_name} to manager: {e}")
+{% for relationship in collection_rels[model.name] %}
+{% set target_name = relationship.target_model.lower() %}
+        # {{ model.name }}-{{ relationship.target_model }} relationship privileges for manager
+        for privilege_name in ['add_{{ target_name }}_to_{{ model_name }}', 'remove_{{ target_name }}_from_{{ model_name }}']:
+            privilege = privilege_repository.get_by_name(privilege_name)
+            if privilege:
+                try:
+                    role_repository.add_privilege(manager_role.id, privilege.id)
+                except Exception as e:
+                    print(f"Error assigning {privilege_name} to manager: {e}")
+{% endfor %}
+{% endfor %}
+
+    # User privileges
+    user_role = role_repository.get_by_name('user')
+    if user_role:
+{% for model in models %}
+{% set model_name = names[model.name][0] %}
+        # {{ model.name }} privileges for user
+        read_privilege = privilege_repository.get_by_name('read_{{ model_name }}')
+        if read_privilege:
+            try:
+                role_repository.add_privilege(user_role.id, read_privilege.id)
+            except Exception as e:
+                print(f"Error assigning read_{{ model_name }} to user: {e}")
+{% endfor %}
+'''
+
+_TEMPLATE_SOURCES = {
+    "privileges": _PRIVILEGES_SRC,
+    "role_privileges": _ROLE_PRIVILEGES_SRC,
+}
+
+# Seed modules that do not depend on the models
+_ROLES_CONTENT = """\"\"\"
 Role seed data for the application.
 \"\"\"
 from src.domain.entities import Role
@@ -110,115 +147,8 @@ def seed_roles(role_repository):
         except Exception as e:
             print(f"Error seeding role {role.name}: {e}")
 """
-        
-        with open(file_path, "w") as f:
-            f.write(content)
-        
-        return file_path
-    
-    def generate_role_privilege_seeds(self, models: List[Model], output_dir: Optional[str] = None) -> str:
-        """Generate role-privilege association seed data."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "role_privileges.py")
-        
-        # Generate privilege assignments for each role
-        admin_privileges = []
-        manager_privileges = []
-        user_privileges = []
-        
-        # Admin gets all privileges
-        admin_privileges.append("    # Admin gets all privileges")
-        admin_privileges.append("    admin_role = role_repository.get_by_name('admin')")
-        admin_privileges.append("    if admin_role:")
-        admin_privileges.append("        for privilege in privilege_repository.list(limit=1000):")
-        admin_privileges.append("            try:")
-        admin_privileges.append("                role_repository.add_privilege(admin_role.id, privilege.id)")
-        admin_privileges.append("            except Exception as e:")
-        admin_privileges.append("                print(f\"Error assigning privilege {privilege.name} to admin: {e}\")")
-        
-        # Manager gets specific privileges
-        manager_privileges.append("    # Manager privileges")
-        manager_privileges.append("    manager_role = role_repository.get_by_name('manager')")
-        manager_privileges.append("    if manager_role:")
-        
-        # User gets specific privileges
-        user_privileges.append("    # User privileges")
-        user_privileges.append("    user_role = role_repository.get_by_name('user')")
-        user_privileges.append("    if user_role:")
-        
-        # Add model-specific privileges
-        for model in models:
-            model_name = model.name.lower()
-            
-            # Managers can do all CRUD operations
-            manager_privileges.extend([
-                f"        # {model.name} privileges for manager",
-                f"        for privilege_name in ['create_{model_name}', 'read_{model_name}', 'update_{model_name}', 'delete_{model_name}']:",
-                f"            privilege = privilege_repository.get_by_name(privilege_name)",
-                f"            if privilege:",
-                f"                try:",
-                f"                    role_repository.add_privilege(manager_role.id, privilege.id)",
-                f"                except Exception as e:",
-                f"                    print(f\"Error assigning {{privilege_name}} to manager: {{e}}\")",
-            ])
-            
-            # Users can only read
-            user_privileges.extend([
-                f"        # {model.name} privileges for user",
-                f"        read_privilege = privilege_repository.get_by_name('read_{model_name}')",
-                f"        if read_privilege:",
-                f"            try:",
-                f"                role_repository.add_privilege(user_role.id, read_privilege.id)",
-                f"            except Exception as e:",
-                f"                print(f\"Error assigning read_{model_name} to user: {{e}}\")",
-            ])
-            
-            # Add relationship privileges for manager
-            for relationship in model.relationships:
-                if relationship.type_name in ["one_to_many", "many_to_many"]:
-                    rel_name = relationship.relationship_name
-                    target_name = relationship.target_model.lower()
-                    manager_privileges.extend([
-                        f"        # {model.name}-{relationship.target_model} relationship privileges for manager",
-                        f"        for privilege_name in ['add_{target_name}_to_{model_name}', 'remove_{target_name}_from_{model_name}']:",
-                        f"            privilege = privilege_repository.get_by_name(privilege_name)",
-                        f"            if privilege:",
-                        f"                try:",
-                        f"                    role_repository.add_privilege(manager_role.id, privilege.id)",
-                        f"                except Exception as e:",
-                        f"                    print(f\"Error assigning {{privilege_name}} to manager: {{e}}\")",
-                    ])
-        
-        content = f"""\"\"\"
-Role-privilege association seed data for the application.
-\"\"\"
 
-def seed_role_privileges(role_repository, privilege_repository):
-    \"\"\"Seed role-privilege associations into the database.\"\"\"
-{os.linesep.join(admin_privileges)}
-
-{os.linesep.join(manager_privileges)}
-
-{os.linesep.join(user_privileges)}
-"""
-        
-        with open(file_path, "w") as f:
-            f.write(content)
-        
-        return file_path
-    
-    def generate_user_seeds(self, output_dir: Optional[str] = None) -> str:
-        """Generate user seed data."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "users.py")
-        
-        content = """\"\"\"
+_USERS_CONTENT = """\"\"\"
 User seed data for the application.
 \"\"\"
 from src.domain.entities import User
@@ -273,21 +203,8 @@ def seed_users(user_repository, password_service):
     except Exception as e:
         print(f"Error seeding regular user: {e}")
 """
-        
-        with open(file_path, "w") as f:
-            f.write(content)
-        
-        return file_path
-    
-    def generate_user_role_seeds(self, output_dir: Optional[str] = None) -> str:
-        """Generate user-role association seed data."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "user_roles.py")
-        
-        content = """\"\"\"
+
+_USER_ROLES_CONTENT = """\"\"\"
 User-role association seed data for the application.
 \"\"\"
 
@@ -320,21 +237,8 @@ def seed_user_roles(user_repository, role_repository):
     except Exception as e:
         print(f"Error assigning user role to regular user: {e}")
 """
-        
-        with open(file_path, "w") as f:
-            f.write(content)
-        
-        return file_path
-    
-    def generate_seed_main(self, output_dir: Optional[str] = None) -> str:
-        """Generate main seed file."""
-        if output_dir is None:
-            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
-        
-        os.makedirs(output_dir, exist_ok=True)
-        file_path = os.path.join(output_dir, "__init__.py")
-        
-        content = """\"\"\"
+
+_SEED_MAIN_CONTENT = """\"\"\"
 Database seed data for the application.
 \"\"\"
 from .privileges import seed_privileges
@@ -365,9 +269,299 @@ async def seed_database(
     # Seed user-role associations
     await seed_user_roles(user_repository, role_repository)
 """
+
+# Fixed parts of the generated API router, and the init_db module filled in with str.replace
+_ROUTER_HEADER = "from fastapi import APIRouter\n\nfrom src.presentation.api.v1.endpoints import auth"
+
+_ROUTER_SETUP = """
+
+
+api_router = APIRouter()
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"])"""
+
+# Per-model lines, formatted with format_map
+_ROUTER_IMPORT_LINE = "\nfrom src.presentation.api.v1.endpoints import {model_name}"
+
+_ROUTER_INCLUDE_LINE = '\napi_router.include_router({model_name}.router, prefix="/{model_plural}", tags=["{model_name}"])'
+
+_INIT_DB_IMPORT_LINE = "from src.infrastructure.persistence.repositories.{model_name} import SQLAlchemy{model}Repository"
+
+_INIT_DB_TMPL = """\"\"\"
+Database initialization script.
+\"\"\"
+import asyncio
+import logging
+
+from src.infrastructure.persistence.database import AsyncDatabase
+from src.infrastructure.persistence.models import Base
+from src.infrastructure.persistence import (
+    SQLAlchemyUserRepository,
+    SQLAlchemyRoleRepository,
+    SQLAlchemyPrivilegeRepository,
+)
+from src.infrastructure.auth import PasswordServiceImpl
+from src.infrastructure.config import DatabaseConfig
+from src.infrastructure.persistence.seeds import seed_database
+{{MODEL_IMPORTS}}
+
+
+async def init_db():
+    \"\"\"Initialize the database.\"\"\"
+    logging.info("Initializing database")
+    
+    # Create database connection
+    db_config = DatabaseConfig.from_env()
+    db = AsyncDatabase(db_config)
+    
+    # Create tables
+    logging.info("Creating database tables")
+    await db.create_tables(Base)
+    
+    # Create repositories
+    user_repository = SQLAlchemyUserRepository(db)
+    role_repository = SQLAlchemyRoleRepository(db)
+    privilege_repository = SQLAlchemyPrivilegeRepository(db)
+    password_service = PasswordServiceImpl()
+    
+    # Seed database
+    logging.info("Seeding database")
+    await seed_database(
+        user_repository=user_repository,
+        role_repository=role_repository,
+        privilege_repository=privilege_repository,
+        password_service=password_service,
+    )
+    
+    logging.info("Database initialization complete")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(init_db())"""
+
+# Fingerprint of the fixed templates, so editing one invalidates stored codegen hashes
+_TEMPLATES_FINGERPRINT = hashlib.blake2b("".join([
+    _PRIVILEGES_SRC,
+    _ROLE_PRIVILEGES_SRC,
+    _ROLES_CONTENT,
+    _USERS_CONTENT,
+    _USER_ROLES_CONTENT,
+    _SEED_MAIN_CONTENT,
+    _ROUTER_HEADER,
+    _ROUTER_SETUP,
+    _ROUTER_IMPORT_LINE,
+    _ROUTER_INCLUDE_LINE,
+    _INIT_DB_IMPORT_LINE,
+    _INIT_DB_TMPL,
+]).encode()).hexdigest()
+
+def _models_hash(models: List[Model]) -> str:
+    """Hash the parts of the models that the CRUD files are generated from."""
+    key = [
+        (
+            model.name,
+            [(field.name, field.type_name) for field in model.fields],
+            [(rel.type_name, rel.target_model) for rel in model.relationships],
+        )
+        for model in models
+    ]
+    return hashlib.blake2b(json.dumps([_TEMPLATES_FINGERPRINT, key]).encode()).hexdigest()
+
+def _write_if_changed(file_path: str, content: str) -> bool:
+    """Write content to a file unless the file already holds exactly that content."""
+    data = content.encode()
+    try:
+        with open(file_path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    
+    _atomic_write(file_path, data)
+    return True
+
+def _atomic_write(file_path: str, data: bytes) -> None:
+    """Write data to a temporary file beside the target, then swap it into place."""
+    tmp_path = file_path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _file_digest(file_path: str) -> Optional[bytes]:
+    """Hash an existing file in blocks, or return None if it does not exist."""
+    digest = hashlib.blake2b()
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.digest()
+
+def _stream_if_changed(file_path: str, chunks: Iterable[str]) -> bool:
+    """Stream chunks into a temporary file and swap it in unless the content is unchanged."""
+    tmp_path = file_path + ".tmp"
+    digest = hashlib.blake2b()
+    try:
+        with open(tmp_path, "wb", buffering=64 * 1024) as f:
+            for chunk in chunks:
+                data = chunk.encode()
+                digest.update(data)
+                f.write(data)
+        
+        if _file_digest(file_path) == digest.digest():
+            os.unlink(tmp_path)
+            return False
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+def _byte_compile(file_path: str) -> None:
+    """Byte-compile a generated module so importing it skips the parse step."""
+    try:
+        py_compile.compile(file_path, doraise=True)
+    except py_compile.PyCompileError:
+        # Leave it to the importer to report; generation itself succeeded
+        pass
+
+class CRUDGenerator:
+    """Generator for creating CRUD operations with role-based access control."""
+    
+    # Compiled templates, shared by all instances
+    _TEMPLATES: Dict[str, jinja2.Template] = {}
+    
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.model_generator = ModelGenerator(output_dir)
+        self._names: Dict[str, Tuple[str, str]] = {}
+        self._created_dirs = set()
+    
+    @classmethod
+    def _get_template(cls, name: str) -> jinja2.Template:
+        """Get a compiled template, compiling it on first use."""
+        template = cls._TEMPLATES.get(name)
+        if template is None:
+            template = cls._TEMPLATES[name] = _env.from_string(_TEMPLATE_SOURCES[name])
+        return template
+    
+    def _ensure_dir(self, path: str) -> None:
+        """Create a directory once per generator instance."""
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+    
+    def _model_names(self, models: List[Model]) -> Dict[str, Tuple[str, str]]:
+        """Get the lowercase and plural name of each model, computing each only once."""
+        for model in models:
+            if model.name not in self._names:
+                model_name = _lower(model.name)
+                self._names[model.name] = (model_name, plural(model_name))
+        return self._names
+    
+    def _collection_relationships(self, models: List[Model]) -> Dict[str, List[ModelRelationship]]:
+        """Get the collection relationships of each model in a single pass."""
+        return {
+            model.name: [rel for rel in model.relationships if rel.type_name in _COLLECTION_TYPES]
+            for model in models
+        }
+    
+    def generate_privilege_seeds(self, models: List[Model], output_dir: Optional[str] = None) -> str:
+        """Generate privilege seed data for all models."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "privileges.py")
+        
+        # Stream the rendered template straight to disk instead of building the whole document
+        chunks = self._get_template("privileges").generate(
+            models=models,
+            names=self._model_names(models),
+            collection_rels=self._collection_relationships(models),
+        )
+        
+        if _stream_if_changed(file_path, chunks):
+            _byte_compile(file_path)
+        
+        return file_path
+    
+    def generate_role_seeds(self, output_dir: Optional[str] = None) -> str:
+        """Generate role seed data."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "roles.py")
+        
+        _write_if_changed(file_path, _ROLES_CONTENT)
         
-        with open(file_path, "w") as f:
-            f.write(content)
+        return file_path
+    
+    def generate_role_privilege_seeds(self, models: List[Model], output_dir: Optional[str] = None) -> str:
+        """Generate role-privilege association seed data."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "role_privileges.py")
+        
+        # Stream the rendered template straight to disk instead of building the whole document
+        chunks = self._get_template("role_privileges").generate(
+            models=models,
+            names=self._model_names(models),
+            collection_rels=self._collection_relationships(models),
+        )
+        
+        if _stream_if_changed(file_path, chunks):
+            _byte_compile(file_path)
+        
+        return file_path
+    
+    def generate_user_seeds(self, output_dir: Optional[str] = None) -> str:
+        """Generate user seed data."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "users.py")
+        
+        _write_if_changed(file_path, _USERS_CONTENT)
+        
+        return file_path
+    
+    def generate_user_role_seeds(self, output_dir: Optional[str] = None) -> str:
+        """Generate user-role association seed data."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "user_roles.py")
+        
+        _write_if_changed(file_path, _USER_ROLES_CONTENT)
+        
+        return file_path
+    
+    def generate_seed_main(self, output_dir: Optional[str] = None) -> str:
+        """Generate main seed file."""
+        if output_dir is None:
+            output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds")
+        
+        self._ensure_dir(output_dir)
+        file_path = os.path.join(output_dir, "__init__.py")
+        
+        _write_if_changed(file_path, _SEED_MAIN_CONTENT)
         
         return file_path
     
@@ -376,28 +570,32 @@ async def seed_database(
         if output_dir is None:
             output_dir = os.path.join(self.output_dir, "app", "presentation", "api", "v1")
         
-        os.makedirs(output_dir, exist_ok=True)
+        self._ensure_dir(output_dir)
         file_path = os.path.join(output_dir, "api.py")
         
-        imports = ["from fastapi import APIRouter", "", "from src.presentation.api.v1.endpoints import auth"]
+        names = self._model_names(models)
+        
+        buf = io.StringIO()
+        buf.write(_ROUTER_HEADER)
+        
+        contexts = [
+            {"model_name": names[model.name][0], "model_plural": names[model.name][1]}
+            for model in models
+        ]
         
         # Add imports for model endpoints
-        for model in models:
-            model_name = model.name.lower()
-            imports.append(f"from src.presentation.api.v1.endpoints import {model_name}")
+        for context in contexts:
+            buf.write(_ROUTER_IMPORT_LINE.format_map(context))
         
-        router_setup = ["", "", "api_router = APIRouter()", "api_router.include_router(auth.router, prefix=\"/auth\", tags=[\"auth\"])"]
+        buf.write(_ROUTER_SETUP)
         
         # Add router includes for model endpoints
-        for model in models:
-            model_name = model.name.lower()
-            model_plural = p.plural(model_name)
-            router_setup.append(f"api_router.include_router({model_name}.router, prefix=\"/{model_plural}\", tags=[\"{model_name}\"])")
+        for context in contexts:
+            buf.write(_ROUTER_INCLUDE_LINE.format_map(context))
         
-        content = "\n".join(imports + router_setup)
+        content = buf.getvalue()
         
-        with open(file_path, "w") as f:
-            f.write(content)
+        _write_if_changed(file_path, content)
         
         return file_path
     
@@ -406,93 +604,53 @@ async def seed_database(
         if output_dir is None:
             output_dir = os.path.join(self.output_dir, "app", "infrastructure", "persistence")
         
-        os.makedirs(output_dir, exist_ok=True)
+        self._ensure_dir(output_dir)
         file_path = os.path.join(output_dir, "init_db.py")
         
-        imports = [
-            "\"\"\"",
-            "Database initialization script.",
-            "\"\"\"",
-            "import asyncio",
-            "import logging",
-            "",
-            "from src.infrastructure.persistence.database import AsyncDatabase",
-            "from src.infrastructure.persistence.models import Base",
-            "from src.infrastructure.persistence import (",
-            "    SQLAlchemyUserRepository,",
-            "    SQLAlchemyRoleRepository,",
-            "    SQLAlchemyPrivilegeRepository,",
-            ")",
-            "from src.infrastructure.auth import PasswordServiceImpl",
-            "from src.infrastructure.config import DatabaseConfig",
-            "from src.infrastructure.persistence.seeds import seed_database",
-        ]
+        names = self._model_names(models)
         
         # Add imports for model repositories
-        for model in models:
-            imports.append(f"from src.infrastructure.persistence.repositories.{model.name.lower()} import SQLAlchemy{model.name}Repository")
-        
-        init_function = [
-            "",
-            "",
-            "async def init_db():",
-            "    \"\"\"Initialize the database.\"\"\"",
-            "    logging.info(\"Initializing database\")",
-            "    ",
-            "    # Create database connection",
-            "    db_config = DatabaseConfig.from_env()",
-            "    db = AsyncDatabase(db_config)",
-            "    ",
-            "    # Create tables",
-            "    logging.info(\"Creating database tables\")",
-            "    await db.create_tables(Base)",
-            "    ",
-            "    # Create repositories",
-            "    user_repository = SQLAlchemyUserRepository(db)",
-            "    role_repository = SQLAlchemyRoleRepository(db)",
-            "    privilege_repository = SQLAlchemyPrivilegeRepository(db)",
-            "    password_service = PasswordServiceImpl()",
-            "    ",
-            "    # Seed database",
-            "    logging.info(\"Seeding database\")",
-            "    await seed_database(",
-            "        user_repository=user_repository,",
-            "        role_repository=role_repository,",
-            "        privilege_repository=privilege_repository,",
-            "        password_service=password_service,",
-            "    )",
-            "    ",
-            "    logging.info(\"Database initialization complete\")",
-            "",
-            "",
-            "if __name__ == \"__main__\":",
-            "    logging.basicConfig(level=logging.INFO)",
-            "    asyncio.run(init_db())",
-        ]
-        
-        content = "\n".join(imports + init_function)
+        model_imports = "\n".join(
+            _INIT_DB_IMPORT_LINE.format_map({"model_name": names[model.name][0], "model": model.name})
+            for model in models
+        )
+        content = _INIT_DB_TMPL.replace("{{MODEL_IMPORTS}}", model_imports)
         
-        with open(file_path, "w") as f:
-            f.write(content)
+        _write_if_changed(file_path, content)
         
         return file_path
     
     def generate_crud_files(self, models: List[Model]) -> List[str]:
         """Generate all CRUD-related files for the models."""
-        files = []
-        
-        # Generate seed files
-        files.append(self.generate_privilege_seeds(models))
-        files.append(self.generate_role_seeds())
-        files.append(self.generate_role_privilege_seeds(models))
-        files.append(self.generate_user_seeds())
-        files.append(self.generate_user_role_seeds())
-        files.append(self.generate_seed_main())
-        
-        # Generate API router updates
-        files.append(self.generate_api_router_updates(models))
+        hash_path = os.path.join(self.output_dir, "app", "infrastructure", "persistence", "seeds", ".codegen_hash")
+        models_hash = _models_hash(models)
+        
+        # Skip generation entirely when the models are unchanged since the last run
+        previous = read_codegen_hash(hash_path)
+        if previous and previous.get("hash") == models_hash and all(os.path.exists(f) for f in previous["files"]):
+            return previous["files"]
+        
+        # Compute model names once, before the generators share them across threads
+        self._model_names(models)
+        
+        tasks = [
+            # Seed files
+            (self.generate_privilege_seeds, (models,)),
+            (self.generate_role_seeds, ()),
+            (self.generate_role_privilege_seeds, (models,)),
+            (self.generate_user_seeds, ()),
+            (self.generate_user_role_seeds, ()),
+            (self.generate_seed_main, ()),
+            # API router updates
+            (self.generate_api_router_updates, (models,)),
+            # Database initialization script
+            (self.generate_database_init_script, (models,)),
+        ]
         
-        # Generate database initialization script
-        files.append(self.generate_database_init_script(models))
+        # The files are independent, so write them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(fn, *args) for fn, args in tasks]
+            files = [future.result() for future in futures]
         
+        _write_if_changed(hash_path, json.dumps({"hash": models_hash, "files": files}))
         return files
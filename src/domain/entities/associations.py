@@ -13,6 +13,8 @@ from .privilege import Privilege
 class UserRole(BaseEntity):
     """Association class for the many-to-many relationship between User and Role."""
     
+    __slots__ = ("user_id", "role_id")
+    
     user_id: uuid.UUID
     role_id: uuid.UUID
     
@@ -30,28 +32,27 @@ class UserRole(BaseEntity):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            **self._base_dict(),
             "user_id": str(self.user_id),
             "role_id": str(self.role_id),
-        })
-        return data
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'UserRole':
         """Create entity from dictionary."""
         return cls(
+            **cls._parse_base_fields(data),
             user_id=uuid.UUID(data["user_id"]),
             role_id=uuid.UUID(data["role_id"]),
-            id=uuid.UUID(data["id"]) if "id" in data else None,
-            created_at=datetime.fromisoformat(data["created_at"]) if "created_at" in data else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if "updated_at" in data else None,
         )
 
 
 class RolePrivilege(BaseEntity):
     """Association class for the many-to-many relationship between Role and Privilege."""
     
+    __slots__ = ("role_id", "privilege_id")
+    
     role_id: uuid.UUID
     privilege_id: uuid.UUID
     
@@ -69,20 +70,17 @@ class RolePrivilege(BaseEntity):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            **self._base_dict(),
             "role_id": str(self.role_id),
             "privilege_id": str(self.privilege_id),
-        })
-        return data
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RolePrivilege':
         """Create entity from dictionary."""
         return cls(
+            **cls._parse_base_fields(data),
             role_id=uuid.UUID(data["role_id"]),
             privilege_id=uuid.UUID(data["privilege_id"]),
-            id=uuid.UUID(data["id"]) if "id" in data else None,
-            created_at=datetime.fromisoformat(data["created_at"]) if "created_at" in data else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if "updated_at" in data else None,
         )
@@ -9,6 +9,8 @@ import uuid
 class BaseEntity:
     """Base entity with timestamp fields and soft delete functionality."""
     
+    __slots__ = ("id", "created_at", "updated_at", "deleted_at", "is_streamable", "_id_str")
+    
     def __init__(
         self,
         id: Optional[uuid.UUID] = None,
@@ -18,21 +20,46 @@ class BaseEntity:
         is_streamable: bool = False,
     ):
         self.id = id or uuid.uuid4()
-        self.created_at = created_at or datetime.utcnow()
-        self.updated_at = updated_at or datetime.utcnow()
+        if created_at is None or updated_at is None:
+            now = datetime.utcnow()
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
         self.deleted_at = deleted_at
         self.is_streamable = is_streamable
+        self._id_str: Optional[str] = None
+    
+    @property
+    def id_str(self) -> str:
+        """String form of the ID, formatted once per entity."""
+        if self._id_str is None:
+            self._id_str = str(self.id)
+        return self._id_str
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
+        return self._base_dict()
+    
+    def _base_dict(self) -> Dict[str, Any]:
+        """Serialize the base fields; subclasses unpack this into their own dict."""
         return {
-            "id": str(self.id),
+            "id": self.id_str,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "deleted_at": self.deleted_at.isoformat() if self.deleted_at else None,
             "is_streamable": self.is_streamable,
         }
     
+    @staticmethod
+    def _parse_base_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse the base fields of a serialized entity, one lookup per key."""
+        return {
+            "id": uuid.UUID(value) if (value := data.get("id")) else None,
+            "created_at": datetime.fromisoformat(value) if (value := data.get("created_at")) else None,
+            "updated_at": datetime.fromisoformat(value) if (value := data.get("updated_at")) else None,
+        }
+    
     def is_deleted(self) -> bool:
         """Check if entity is soft deleted."""
         return self.deleted_at is not None
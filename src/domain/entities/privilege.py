@@ -10,6 +10,8 @@ from .base import BaseEntity
 class Privilege(BaseEntity):
     """Privilege entity representing a system permission."""
     
+    __slots__ = ("name", "description")
+    
     name: str
     description: Optional[str]
     
@@ -27,20 +29,17 @@ class Privilege(BaseEntity):
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            **self._base_dict(),
             "name": self.name,
             "description": self.description,
-        })
-        return data
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Privilege':
         """Create entity from dictionary."""
         return cls(
+            **cls._parse_base_fields(data),
             name=data["name"],
             description=data.get("description"),
-            id=uuid.UUID(data["id"]) if "id" in data else None,
-            created_at=datetime.fromisoformat(data["created_at"]) if "created_at" in data else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if "updated_at" in data else None,
         )
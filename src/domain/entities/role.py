@@ -2,7 +2,7 @@
 Role entity for the authentication system.
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet, Set
 import uuid
 
 from .base import BaseEntity
@@ -11,9 +11,10 @@ from .privilege import Privilege
 class Role(BaseEntity):
     """Role entity representing a user role with associated privileges."""
     
+    __slots__ = ("name", "description", "_privileges", "_privilege_ids", "_privilege_names")
+    
     name: str
     description: Optional[str]
-    privileges: List[Privilege]
     
     def __init__(
         self,
@@ -29,41 +30,55 @@ class Role(BaseEntity):
         self.description = description
         self.privileges = privileges or []
     
+    @property
+    def privileges(self) -> List[Privilege]:
+        """Privileges granted by the role."""
+        return self._privileges
+    
+    @privileges.setter
+    def privileges(self, privileges: List[Privilege]) -> None:
+        self._privileges = privileges
+        # Shadows the list so membership checks don't scan it
+        self._privilege_ids: Set[uuid.UUID] = {privilege.id for privilege in privileges}
+        self._privilege_names: Optional[FrozenSet[str]] = None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            **self._base_dict(),
             "name": self.name,
             "description": self.description,
-            "privileges": [str(privilege.id) for privilege in self.privileges],
-        })
-        return data
+            "privileges": [privilege.id_str for privilege in self.privileges],
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any], privileges: Optional[List[Privilege]] = None) -> 'Role':
         """Create entity from dictionary."""
         return cls(
+            **cls._parse_base_fields(data),
             name=data["name"],
             description=data.get("description"),
             privileges=privileges or [],
-            id=uuid.UUID(data["id"]) if "id" in data else None,
-            created_at=datetime.fromisoformat(data["created_at"]) if "created_at" in data else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if "updated_at" in data else None,
         )
     
     def has_privilege(self, privilege_name: str) -> bool:
         """Check if role has a specific privilege."""
-        for privilege in self.privileges:
-            if privilege.name == privilege_name:
-                return True
-        return False
+        if self._privilege_names is None:
+            self._privilege_names = frozenset(privilege.name for privilege in self._privileges)
+        return privilege_name in self._privilege_names
     
     def add_privilege(self, privilege: Privilege) -> None:
         """Add a privilege to the role."""
-        if privilege not in self.privileges:
-            self.privileges.append(privilege)
+        if privilege.id in self._privilege_ids:
+            return
+        self._privilege_ids.add(privilege.id)
+        self._privileges.append(privilege)
+        self._privilege_names = None
     
     def remove_privilege(self, privilege: Privilege) -> None:
         """Remove a privilege from the role."""
-        if privilege in self.privileges:
-            self.privileges.remove(privilege)
+        if privilege.id not in self._privilege_ids:
+            return
+        self._privilege_ids.remove(privilege.id)
+        self._privileges[:] = [item for item in self._privileges if item.id != privilege.id]
+        self._privilege_names = None
@@ -2,7 +2,7 @@
 User entity for the authentication system.
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet
 import uuid
 
 from .base import BaseEntity
@@ -10,13 +10,14 @@ from .base import BaseEntity
 class User(BaseEntity):
     """User entity representing a system user."""
     
+    __slots__ = ("username", "email", "hashed_password", "full_name", "is_active", "is_superuser", "_roles", "_privilege_names")
+    
     username: str
     email: str
     hashed_password: str
     full_name: Optional[str]
     is_active: bool
     is_superuser: bool
-    roles: List['Role']
     
     def __init__(
         self,
@@ -40,24 +41,35 @@ class User(BaseEntity):
         self.is_superuser = is_superuser
         self.roles = roles or []
     
+    @property
+    def roles(self) -> List['Role']:
+        """Roles assigned to the user."""
+        return self._roles
+    
+    @roles.setter
+    def roles(self, roles: List['Role']) -> None:
+        self._roles = roles
+        # A new set of roles makes any privilege index stale
+        self._privilege_names: Optional[FrozenSet[str]] = None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert entity to dictionary."""
-        data = super().to_dict()
-        data.update({
+        return {
+            **self._base_dict(),
             "username": self.username,
             "email": self.email,
             "hashed_password": self.hashed_password,
             "full_name": self.full_name,
             "is_active": self.is_active,
             "is_superuser": self.is_superuser,
-            "roles": [str(role.id) for role in self.roles],
-        })
-        return data
+            "roles": [role.id_str for role in self.roles],
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any], roles: Optional[List['Role']] = None) -> 'User':
         """Create entity from dictionary."""
         return cls(
+            **cls._parse_base_fields(data),
             username=data["username"],
             email=data["email"],
             hashed_password=data["hashed_password"],
@@ -65,19 +77,25 @@ class User(BaseEntity):
             is_active=data.get("is_active", True),
             is_superuser=data.get("is_superuser", False),
             roles=roles or [],
-            id=uuid.UUID(data["id"]) if "id" in data else None,
-            created_at=datetime.fromisoformat(data["created_at"]) if "created_at" in data else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if "updated_at" in data else None,
         )
     
+    @property
+    def privileges_indexed(self) -> bool:
+        """Whether the user's privilege names have been indexed."""
+        return self._privilege_names is not None
+    
+    def index_privileges(self, names: Optional[FrozenSet[str]] = None) -> None:
+        """Index the names of the privileges granted through the loaded roles, or the given names."""
+        if names is None:
+            names = frozenset(privilege.name for role in self.roles for privilege in role.privileges)
+        self._privilege_names = names
+    
     def has_privilege(self, privilege_name: str) -> bool:
         """Check if user has a specific privilege through any of their roles."""
         if self.is_superuser:
             return True
         
-        for role in self.roles:
-            for privilege in role.privileges:
-                if privilege.name == privilege_name:
-                    return True
+        if self._privilege_names is not None:
+            return privilege_name in self._privilege_names
         
-        return False
+        return any(role.has_privilege(privilege_name) for role in self.roles)
@@ -0,0 +1,53 @@
+"""
+Domain exceptions for the authentication system.
+"""
+
+class DomainError(ValueError):
+    """Base class for domain errors; the message is only formatted when read."""
+    
+    template = "%s"
+    
+    def __str__(self) -> str:
+        return self.template % self.args
+
+
+class UserAlreadyExists(DomainError):
+    """Raised when a username is already taken."""
+    
+    template = "Username '%s' already exists"
+
+
+class EmailAlreadyExists(DomainError):
+    """Raised when an email is already registered."""
+    
+    template = "Email '%s' already exists"
+
+
+class RoleAlreadyExists(DomainError):
+    """Raised when a role name is already taken."""
+    
+    template = "Role '%s' already exists"
+
+
+class PrivilegeAlreadyExists(DomainError):
+    """Raised when a privilege name is already taken."""
+    
+    template = "Privilege '%s' already exists"
+
+
+class UserNotFound(DomainError):
+    """Raised when a user does not exist."""
+    
+    template = "User with ID %s not found"
+
+
+class RoleNotFound(DomainError):
+    """Raised when a role does not exist."""
+    
+    template = "Role with ID %s not found"
+
+
+class PrivilegeNotFound(DomainError):
+    """Raised when a privilege does not exist."""
+    
+    template = "Privilege with ID %s not found"
@@ -2,7 +2,7 @@
 Repository interfaces for the authentication system.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 
 from src.domain.entities import User, Role, Privilege, UserRole, RolePrivilege
@@ -12,7 +12,18 @@ class UserRepository(ABC):
     
     @abstractmethod
     async def create(self, user: User) -> User:
-        """Create a new user."""
+        """Create a new user.
+        
+        Raises ValueError if the username or email already exists.
+        """
+        pass
+    
+    @abstractmethod
+    async def create_many(self, users: List[User]) -> List[User]:
+        """Create multiple users in a single batch.
+        
+        Raises ValueError if any username or email already exists.
+        """
         pass
     
     @abstractmethod
@@ -30,6 +41,11 @@ class UserRepository(ABC):
         """Get user by email."""
         pass
     
+    @abstractmethod
+    async def get_by_username_or_email(self, identifier: str) -> Optional[User]:
+        """Get user by username, or by email if no username matches."""
+        pass
+    
     @abstractmethod
     async def update(self, user: User) -> User:
         """Update an existing user."""
@@ -46,8 +62,13 @@ class UserRepository(ABC):
         pass
     
     @abstractmethod
-    async def add_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> UserRole:
-        """Add a role to a user."""
+    async def add_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> User:
+        """Add a role to a user and return the updated user."""
+        pass
+    
+    @abstractmethod
+    async def add_roles_bulk(self, pairs: List[Tuple[uuid.UUID, uuid.UUID]]) -> List[UserRole]:
+        """Add roles to users in a single batch of (user_id, role_id) pairs."""
         pass
     
     @abstractmethod
@@ -59,6 +80,11 @@ class UserRepository(ABC):
     async def get_roles(self, user_id: uuid.UUID) -> List[Role]:
         """Get all roles for a user."""
         pass
+    
+    @abstractmethod
+    async def get_roles_with_privileges(self, user_id: uuid.UUID) -> List[Role]:
+        """Get all roles for a user with their privileges loaded."""
+        pass
 
 
 class RoleRepository(ABC):
@@ -66,7 +92,10 @@ class RoleRepository(ABC):
     
     @abstractmethod
     async def create(self, role: Role) -> Role:
-        """Create a new role."""
+        """Create a new role.
+        
+        Raises ValueError if the name already exists.
+        """
         pass
     
     @abstractmethod
@@ -95,8 +124,13 @@ class RoleRepository(ABC):
         pass
     
     @abstractmethod
-    async def add_privilege(self, role_id: uuid.UUID, privilege_id: uuid.UUID) -> RolePrivilege:
-        """Add a privilege to a role."""
+    async def add_privilege(self, role_id: uuid.UUID, privilege_id: uuid.UUID) -> Role:
+        """Add a privilege to a role and return the updated role."""
+        pass
+    
+    @abstractmethod
+    async def add_privileges_bulk(self, pairs: List[Tuple[uuid.UUID, uuid.UUID]]) -> List[RolePrivilege]:
+        """Add privileges to roles in a single batch of (role_id, privilege_id) pairs."""
         pass
     
     @abstractmethod
@@ -115,7 +149,10 @@ class PrivilegeRepository(ABC):
     
     @abstractmethod
     async def create(self, privilege: Privilege) -> Privilege:
-        """Create a new privilege."""
+        """Create a new privilege.
+        
+        Raises ValueError if the name already exists.
+        """
         pass
     
     @abstractmethod
@@ -2,7 +2,7 @@
 Authentication service interfaces for the domain layer.
 """
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import uuid
 
 from src.domain.entities import User
@@ -25,24 +25,34 @@ class TokenService(ABC):
     """Service interface for token generation and validation."""
     
     @abstractmethod
-    def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[int] = None) -> str:
+    def create_access_token(self, sub: str, expires_delta: Optional[int] = None) -> str:
         """Create an access token."""
         pass
     
     @abstractmethod
-    def create_refresh_token(self, data: Dict[str, Any], expires_delta: Optional[int] = None) -> str:
+    def create_refresh_token(self, sub: str, expires_delta: Optional[int] = None) -> str:
         """Create a refresh token."""
         pass
     
+    @abstractmethod
+    def create_access_and_refresh(self, sub: str) -> Tuple[str, str]:
+        """Create an access token and a refresh token for the same subject."""
+        pass
+    
     @abstractmethod
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify a token and return its payload."""
+        """Verify a token and return its payload, with `sub` as a UUID."""
         pass
     
     @abstractmethod
     def get_user_id_from_token(self, token: str) -> Optional[uuid.UUID]:
         """Extract user ID from a token."""
         pass
+    
+    @abstractmethod
+    def get_jwks(self) -> Dict[str, Any]:
+        """Get the JSON Web Key Set for verifying issued tokens."""
+        pass
 
 
 class AuthService(ABC):
@@ -62,3 +72,13 @@ class AuthService(ABC):
     async def check_user_privilege(self, user: User, privilege_name: str) -> bool:
         """Check if a user has a specific privilege."""
         pass
+    
+    @abstractmethod
+    async def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Forget cached privileges for a user whose roles changed."""
+        pass
+    
+    @abstractmethod
+    async def invalidate_role(self, role_id: uuid.UUID) -> None:
+        """Forget cached privileges that depend on a role whose privileges changed."""
+        pass
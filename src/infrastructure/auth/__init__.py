@@ -5,9 +5,11 @@ Export all authentication services.
 from .password import PasswordServiceImpl
 from .token import TokenServiceImpl
 from .auth import AuthServiceImpl
+from .cache import CachedAuthService
 
 __all__ = [
     "PasswordServiceImpl",
     "TokenServiceImpl",
     "AuthServiceImpl",
+    "CachedAuthService",
 ]
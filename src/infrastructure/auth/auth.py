@@ -1,13 +1,30 @@
 """
 Implementation of authentication service.
 """
-from typing import Optional, List
+from typing import Optional, List, FrozenSet, Tuple
+import asyncio
 import uuid
 
+from cachetools import TTLCache
+
 from src.domain.entities import User, Role, Privilege
 from src.domain.services.auth import AuthService, PasswordService, TokenService
 from src.domain.repositories.auth import UserRepository, RoleRepository, PrivilegeRepository
 
+# Privilege names per user, stamped with the grant versions they were loaded under. Entries
+# are checked against the current versions, so role changes in this process take effect at
+# once; the TTL only bounds staleness from changes made by other processes. The service is
+# created per request, so these live at module level to be shared across requests.
+_privilege_sets: TTLCache = TTLCache(maxsize=100_000, ttl=30)
+# Invalidation also drops the cached entry, so a version only has to outlive loads already
+# in flight; expiring it with the entries keeps this bounded.
+_role_versions: TTLCache = TTLCache(maxsize=100_000, ttl=30)
+_grants_version = 0
+
+def _grant_stamp(user_id: uuid.UUID) -> Tuple[int, int]:
+    """Get the versions a user's cached privileges must match to still be valid."""
+    return _role_versions.get(user_id, 0), _grants_version
+
 class AuthServiceImpl(AuthService):
     """Implementation of authentication service."""
     
@@ -25,30 +42,31 @@ class AuthServiceImpl(AuthService):
         self.password_service = password_service
         self.token_service = token_service
     
+    async def _load_roles(self, user: User) -> None:
+        """Load a user's roles and the privileges of each role."""
+        # Roles and privileges come back from a single joined query
+        user.roles = await self.user_repository.get_roles_with_privileges(user.id)
+    
     async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user with username and password."""
-        user = await self.user_repository.get_by_username(username)
+        # The login name may be either the username or the email
+        user = await self.user_repository.get_by_username_or_email(username)
         if not user:
-            # Try with email
-            user = await self.user_repository.get_by_email(username)
-            if not user:
-                return None
+            return None
         
         if not user.is_active:
             return None
         
-        if not self.password_service.verify_password(password, user.hashed_password):
+        # Verify password off the event loop; password hashing is deliberately slow
+        password_valid = await asyncio.to_thread(
+            self.password_service.verify_password, password, user.hashed_password
+        )
+        if not password_valid:
             return None
         
-        # Load user roles
-        roles = await self.user_repository.get_roles(user.id)
-        user.roles = roles
-        
-        # Load privileges for each role
-        for role in user.roles:
-            privileges = await self.role_repository.get_privileges(role.id)
-            role.privileges = privileges
-        
+        # Roles are serialized in responses, so superusers get them too
+        await self._load_roles(user)
+        user.index_privileges()
         return user
     
     async def get_current_user(self, token: str) -> Optional[User]:
@@ -61,15 +79,9 @@ class AuthServiceImpl(AuthService):
         if not user or not user.is_active:
             return None
         
-        # Load user roles
-        roles = await self.user_repository.get_roles(user.id)
-        user.roles = roles
-        
-        # Load privileges for each role
-        for role in user.roles:
-            privileges = await self.role_repository.get_privileges(role.id)
-            role.privileges = privileges
-        
+        # Roles are serialized in responses, so superusers get them too
+        await self._load_roles(user)
+        user.index_privileges()
         return user
     
     async def check_user_privilege(self, user: User, privilege_name: str) -> bool:
@@ -77,20 +89,33 @@ class AuthServiceImpl(AuthService):
         if user.is_superuser:
             return True
         
-        # If roles are not loaded, load them
-        if not user.roles:
-            roles = await self.user_repository.get_roles(user.id)
-            user.roles = roles
-            
-            # Load privileges for each role
-            for role in user.roles:
-                privileges = await self.role_repository.get_privileges(role.id)
-                role.privileges = privileges
+        if user.privileges_indexed:
+            return user.has_privilege(privilege_name)
         
-        # Check if any role has the privilege
-        for role in user.roles:
-            for privilege in role.privileges:
-                if privilege.name == privilege_name:
-                    return True
+        stamp = _grant_stamp(user.id)
+        cached = _privilege_sets.get(user.id)
+        if cached and cached[0] == stamp:
+            user.index_privileges(cached[1])
+            return user.has_privilege(privilege_name)
         
-        return False
+        # Roles from other lookups come without their privileges, so always reload them
+        await self._load_roles(user)
+        
+        names: FrozenSet[str] = frozenset(
+            privilege.name for role in user.roles for privilege in role.privileges
+        )
+        _privilege_sets[user.id] = (stamp, names)
+        user.index_privileges(names)
+        return user.has_privilege(privilege_name)
+    
+    async def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Forget cached privileges for a user whose roles changed."""
+        _role_versions[user_id] = _role_versions.get(user_id, 0) + 1
+        _privilege_sets.pop(user_id, None)
+    
+    async def invalidate_role(self, role_id: uuid.UUID) -> None:
+        """Forget cached privileges for every user, after a role's privileges changed."""
+        # Role membership is not tracked here, so one version covers all grants
+        global _grants_version
+        _grants_version += 1
+        _privilege_sets.clear()
@@ -0,0 +1,120 @@
+"""
+Authentication service that keeps user privileges in DragonFlyDB.
+"""
+from typing import Optional, FrozenSet, Set
+import logging
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.domain.entities import User
+from src.domain.repositories.auth import UserRepository
+from src.domain.services.auth import AuthService
+
+# Stored in every privilege set, so users without privileges still get a cache entry
+_EMPTY_MARKER = ""
+
+def _privileges_key(user_id: uuid.UUID) -> str:
+    """Get the key of the set of privilege names granted to a user."""
+    return f"user:{user_id}:privs"
+
+def _role_users_key(role_id: uuid.UUID) -> str:
+    """Get the key of the set of users whose cached privileges came from a role."""
+    return f"role:{role_id}:users"
+
+class CachedAuthService(AuthService):
+    """Authentication service that answers privilege checks from sets cached in DragonFlyDB."""
+    
+    def __init__(
+        self,
+        auth_service: AuthService,
+        user_repository: UserRepository,
+        cache: Redis,
+        ttl: int = 300,
+    ):
+        self.auth_service = auth_service
+        self.user_repository = user_repository
+        self.cache = cache
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        # Users whose privilege index was built from, or stored into, this cache
+        self._indexed: Set[uuid.UUID] = set()
+    
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
+        """Authenticate a user and cache their privileges."""
+        user = await self.auth_service.authenticate_user(username, password)
+        if user and not user.is_superuser:
+            # The wrapped service loads roles with their privileges on login
+            await self._store_privileges(user)
+        return user
+    
+    async def get_current_user(self, token: str) -> Optional[User]:
+        """Get the current user from a token."""
+        return await self.auth_service.get_current_user(token)
+    
+    async def check_user_privilege(self, user: User, privilege_name: str) -> bool:
+        """Check if a user has a specific privilege, using the cached set when present."""
+        if user.is_superuser:
+            return True
+        
+        # A user indexed from this cache earlier in the request needs no round trip at all
+        if user.id in self._indexed and user.privileges_indexed:
+            return user.has_privilege(privilege_name)
+        
+        try:
+            members = await self.cache.smembers(_privileges_key(user.id))
+        except RedisError as e:
+            self.logger.warning(f"Privilege cache unavailable: {e}")
+            return await self.auth_service.check_user_privilege(user, privilege_name)
+        
+        if members:
+            user.index_privileges(frozenset(member.decode() for member in members) - {_EMPTY_MARKER})
+            self._indexed.add(user.id)
+            return user.has_privilege(privilege_name)
+        
+        # Roles from other lookups come without their privileges, so always reload them
+        user.roles = await self.user_repository.get_roles_with_privileges(user.id)
+        await self._store_privileges(user)
+        return user.has_privilege(privilege_name)
+    
+    async def invalidate_user(self, user_id: uuid.UUID) -> None:
+        """Drop the cached privileges of a user whose roles changed."""
+        await self.auth_service.invalidate_user(user_id)
+        try:
+            await self.cache.delete(_privileges_key(user_id))
+        except RedisError as e:
+            self.logger.warning(f"Failed to invalidate cached privileges for user {user_id}: {e}")
+    
+    async def invalidate_role(self, role_id: uuid.UUID) -> None:
+        """Drop the cached privileges of every user holding a role whose privileges changed."""
+        await self.auth_service.invalidate_role(role_id)
+        role_key = _role_users_key(role_id)
+        try:
+            user_ids = await self.cache.smembers(role_key)
+            await self.cache.delete(role_key, *(_privileges_key(user_id.decode()) for user_id in user_ids))
+        except RedisError as e:
+            self.logger.warning(f"Failed to invalidate cached privileges for role {role_id}: {e}")
+    
+    async def _store_privileges(self, user: User) -> None:
+        """Index and cache the privilege names of a user whose roles and privileges are loaded."""
+        names: FrozenSet[str] = frozenset(
+            privilege.name for role in user.roles for privilege in role.privileges
+        )
+        user.index_privileges(names)
+        self._indexed.add(user.id)
+        key = _privileges_key(user.id)
+        user_id = str(user.id)
+        try:
+            async with self.cache.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.sadd(key, _EMPTY_MARKER, *names)
+                pipe.expire(key, self.ttl)
+                # Record which users each role fed, so role changes can find them
+                for role in user.roles:
+                    role_key = _role_users_key(role.id)
+                    pipe.sadd(role_key, user_id)
+                    pipe.expire(role_key, self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            self.logger.warning(f"Failed to cache privileges for user {user.id}: {e}")
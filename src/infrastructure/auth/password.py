@@ -1,20 +1,36 @@
 """
 Implementation of password service for authentication.
 """
-from passlib.context import CryptContext
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import bcrypt
 
 from src.domain.services.auth import PasswordService
 
 class PasswordServiceImpl(PasswordService):
-    """Implementation of password service using passlib."""
+    """Implementation of password service using argon2id."""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
     
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        return self.pwd_context.hash(password)
+        """Hash a password using argon2id."""
+        return self.password_hasher.hash(password)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against a hash."""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        if not hashed_password.startswith("$argon2"):
+            return self._verify_legacy(plain_password, hashed_password)
+        
+        try:
+            return self.password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def _verify_legacy(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a bcrypt hash created before the switch to argon2id."""
+        # bcrypt only reads the first 72 bytes; the old passlib hashes were made the same way
+        try:
+            return bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode())
+        except ValueError:
+            return False
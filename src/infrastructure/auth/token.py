@@ -1,55 +1,131 @@
 """
 Implementation of token service for authentication using JWT.
 """
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+import base64
+import hashlib
+import json
+import time
 import uuid
 import jwt
+from cachetools import TTLCache
+from jwt.algorithms import get_default_algorithms
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 from src.domain.services.auth import TokenService
 
+# Claims every token must carry; shared by all decodes instead of rebuilt per call
+_DECODE_OPTIONS = {"require": ["exp", "sub", "type"]}
+
 class TokenServiceImpl(TokenService):
     """Implementation of token service using PyJWT."""
     
-    def __init__(self, secret_key: str, algorithm: str = "HS256", access_token_expire_minutes: int = 30):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        access_token_expire_minutes: int = 30,
+        private_key: Optional[str] = None,
+        refresh_token_expire_days: int = 7,
+    ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
+        self.refresh_token_expire_days = refresh_token_expire_days
+        self._jwk = None
+        self._headers = None
+        self._jwt = jwt.PyJWT()
+        self._algorithms = [algorithm]
+        # Verified payloads keyed by SHA256 of the token; failed verifications are never cached
+        self._verified: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+        
+        # Load keys once instead of on every encode/decode
+        if algorithm == "EdDSA":
+            # A generated key would differ per process and restart, so one must be configured
+            if not private_key:
+                raise ValueError("EdDSA signing requires a configured Ed25519 private key")
+            self._key = serialization.load_pem_private_key(private_key.encode(), password=None)
+            if not isinstance(self._key, Ed25519PrivateKey):
+                raise ValueError("EdDSA signing requires an Ed25519 private key")
+            self._verify_key = self._key.public_key()
+            self._jwk = self._build_public_jwk()
+            self._headers = {"kid": self._jwk["kid"]}
+        else:
+            self._key = get_default_algorithms()[algorithm].prepare_key(secret_key)
+            self._verify_key = self._key
     
-    def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[int] = None) -> str:
+    def create_access_token(self, sub: str, expires_delta: Optional[int] = None) -> str:
         """Create an access token."""
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(
-            minutes=expires_delta if expires_delta else self.access_token_expire_minutes
-        )
-        to_encode.update({"exp": expire, "type": "access"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        now = int(time.time())
+        minutes = self.access_token_expire_minutes if expires_delta is None else expires_delta
+        claims = {"sub": sub, "type": "access", "iat": now, "exp": now + minutes * 60}
+        return self._jwt.encode(claims, self._key, algorithm=self.algorithm, headers=self._headers)
     
-    def create_refresh_token(self, data: Dict[str, Any], expires_delta: Optional[int] = None) -> str:
+    def create_refresh_token(self, sub: str, expires_delta: Optional[int] = None) -> str:
         """Create a refresh token."""
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(
-            days=7 if expires_delta is None else expires_delta
+        now = int(time.time())
+        days = self.refresh_token_expire_days if expires_delta is None else expires_delta
+        claims = {"sub": sub, "type": "refresh", "iat": now, "exp": now + days * 86400}
+        return self._jwt.encode(claims, self._key, algorithm=self.algorithm, headers=self._headers)
+    
+    def create_access_and_refresh(self, sub: str) -> Tuple[str, str]:
+        """Create an access token and a refresh token for the same subject."""
+        now = int(time.time())
+        access_claims = {"sub": sub, "type": "access", "iat": now, "exp": now + self.access_token_expire_minutes * 60}
+        refresh_claims = {"sub": sub, "type": "refresh", "iat": now, "exp": now + self.refresh_token_expire_days * 86400}
+        return (
+            self._jwt.encode(access_claims, self._key, algorithm=self.algorithm, headers=self._headers),
+            self._jwt.encode(refresh_claims, self._key, algorithm=self.algorithm, headers=self._headers),
         )
-        to_encode.update({"exp": expire, "type": "refresh"})
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify a token and return its payload."""
+        """Verify a token and return its payload with `sub` parsed to a UUID."""
+        key = hashlib.sha256(token.encode()).digest()
+        cached = self._verified.get(key)
+        if cached:
+            if time.time() < cached["exp"]:
+                return dict(cached)
+            self._verified.pop(key, None)
+        
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
+            payload = self._jwt.decode(
+                token,
+                self._verify_key,
+                algorithms=self._algorithms,
+                options=_DECODE_OPTIONS,
+            )
         except jwt.PyJWTError:
             return None
+        
+        if "sub" in payload:
+            try:
+                payload["sub"] = uuid.UUID(payload["sub"])
+            except (TypeError, ValueError):
+                return None
+        
+        self._verified[key] = payload
+        return dict(payload)
     
     def get_user_id_from_token(self, token: str) -> Optional[uuid.UUID]:
         """Extract user ID from a token."""
         payload = self.verify_token(token)
-        if payload and "sub" in payload:
-            try:
-                return uuid.UUID(payload["sub"])
-            except ValueError:
-                return None
+        if payload:
+            return payload.get("sub")
         return None
+    
+    def get_jwks(self) -> Dict[str, Any]:
+        """Get the JSON Web Key Set for verifying issued tokens."""
+        # Symmetric secrets must never be published
+        return {"keys": [self._jwk] if self._jwk else []}
+    
+    def _build_public_jwk(self) -> Dict[str, Any]:
+        """Build the public JWK for the Ed25519 signing key, keyed by its RFC 7638 thumbprint."""
+        raw = self._verify_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw,
+        )
+        x = base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+        thumbprint = json.dumps({"crv": "Ed25519", "kty": "OKP", "x": x}, separators=(",", ":"), sort_keys=True)
+        kid = base64.urlsafe_b64encode(hashlib.sha256(thumbprint.encode()).digest()).rstrip(b"=").decode()
+        return {"kty": "OKP", "crv": "Ed25519", "x": x, "kid": kid, "alg": "EdDSA", "use": "sig"}
@@ -16,6 +16,8 @@ class DatabaseConfig:
         database: str = "fastapi_db",
         min_connections: int = 1,
         max_connections: int = 10,
+        pool_recycle: int = -1,
+        statement_cache_size: int = 500,
     ):
         self.host = host
         self.port = port
@@ -24,6 +26,8 @@ class DatabaseConfig:
         self.database = database
         self.min_connections = min_connections
         self.max_connections = max_connections
+        self.pool_recycle = pool_recycle
+        self.statement_cache_size = statement_cache_size
     
     @property
     def connection_string(self) -> str:
@@ -40,6 +44,8 @@ class DatabaseConfig:
             "database": self.database,
             "min_connections": self.min_connections,
             "max_connections": self.max_connections,
+            "pool_recycle": self.pool_recycle,
+            "statement_cache_size": self.statement_cache_size,
         }
     
     @classmethod
@@ -53,6 +59,8 @@ class DatabaseConfig:
             database=data.get("database", "fastapi_db"),
             min_connections=data.get("min_connections", 1),
             max_connections=data.get("max_connections", 10),
+            pool_recycle=data.get("pool_recycle", -1),
+            statement_cache_size=data.get("statement_cache_size", 500),
         )
     
     @classmethod
@@ -66,6 +74,8 @@ class DatabaseConfig:
             database=os.getenv("POSTGRES_DB", "fastapi_db"),
             min_connections=int(os.getenv("POSTGRES_MIN_CONNECTIONS", "1")),
             max_connections=int(os.getenv("POSTGRES_MAX_CONNECTIONS", "10")),
+            pool_recycle=int(os.getenv("POSTGRES_POOL_RECYCLE", "-1")),
+            statement_cache_size=int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "500")),
         )
 
 
@@ -13,11 +13,13 @@ class JWTConfig:
         algorithm: str = "HS256",
         access_token_expire_minutes: int = 30,
         refresh_token_expire_days: int = 7,
+        private_key: Optional[str] = None,
     ):
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_days = refresh_token_expire_days
+        self.private_key = private_key
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary."""
@@ -26,6 +28,7 @@ class JWTConfig:
             "algorithm": self.algorithm,
             "access_token_expire_minutes": self.access_token_expire_minutes,
             "refresh_token_expire_days": self.refresh_token_expire_days,
+            "private_key": self.private_key,
         }
     
     @classmethod
@@ -36,6 +39,7 @@ class JWTConfig:
             algorithm=data.get("algorithm", "HS256"),
             access_token_expire_minutes=data.get("access_token_expire_minutes", 30),
             refresh_token_expire_days=data.get("refresh_token_expire_days", 7),
+            private_key=data.get("private_key"),
         )
     
     @classmethod
@@ -46,4 +50,5 @@ class JWTConfig:
             algorithm=os.getenv("JWT_ALGORITHM", "HS256"),
             access_token_expire_minutes=int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
             refresh_token_expire_days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7")),
+            private_key=os.getenv("JWT_PRIVATE_KEY"),
         )
@@ -51,13 +51,16 @@ class AsyncDatabase:
     
     def __init__(self, config: DatabaseConfig):
         self.config = config
-        # Convert connection string to async format
+        # Convert connection string to async format; the asyncpg dialect reads its
+        # per-connection prepared statement cache size from the URL
         async_conn_string = config.connection_string.replace("postgresql://", "postgresql+asyncpg://")
+        async_conn_string += f"?prepared_statement_cache_size={config.statement_cache_size}"
         self.engine = create_async_engine(
             async_conn_string,
             pool_pre_ping=True,
             pool_size=config.min_connections,
             max_overflow=config.max_connections - config.min_connections,
+            pool_recycle=config.pool_recycle,
         )
         self.SessionLocal = async_sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
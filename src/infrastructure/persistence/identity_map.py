@@ -0,0 +1,36 @@
+"""
+Request-scoped identity map for repository lookups.
+"""
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Hashable, Optional
+
+# Entities loaded during the current request, keyed by (kind, id).
+# Outside a request scope the map is None and nothing is cached.
+_identity_map: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar("identity_map", default=None)
+
+def begin_request_scope() -> Token:
+    """Start an empty identity map for the current request."""
+    return _identity_map.set({})
+
+def end_request_scope(token: Token) -> None:
+    """Discard the identity map of the current request."""
+    _identity_map.reset(token)
+
+def get_cached(key: Hashable) -> Optional[Any]:
+    """Get an entity already loaded in this request."""
+    identity_map = _identity_map.get()
+    if identity_map is None:
+        return None
+    return identity_map.get(key)
+
+def store(key: Hashable, entity: Any) -> None:
+    """Remember an entity for the rest of this request."""
+    identity_map = _identity_map.get()
+    if identity_map is not None:
+        identity_map[key] = entity
+
+def evict(key: Hashable) -> None:
+    """Forget an entity after it has been written."""
+    identity_map = _identity_map.get()
+    if identity_map is not None:
+        identity_map.pop(key, None)
@@ -1,18 +1,35 @@
 """
 Repository implementations for the authentication system.
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, delete
+from sqlalchemy import update, delete, insert, or_
+from sqlalchemy.exc import IntegrityError
 
 from src.domain.entities import User, Role, Privilege, UserRole, RolePrivilege
+from src.domain.exceptions import (
+    UserAlreadyExists,
+    EmailAlreadyExists,
+    RoleAlreadyExists,
+    PrivilegeAlreadyExists,
+    UserNotFound,
+    RoleNotFound,
+    PrivilegeNotFound,
+)
 from src.domain.repositories.auth import UserRepository, RoleRepository, PrivilegeRepository
-from src.infrastructure.persistence.models import UserModel, RoleModel, PrivilegeModel
+from src.infrastructure.persistence.models import (
+    UserModel,
+    RoleModel,
+    PrivilegeModel,
+    user_role_association,
+    role_privilege_association,
+)
 from src.infrastructure.persistence.database import AsyncDatabase
+from src.infrastructure.persistence.identity_map import get_cached, store, evict
 
 class SQLAlchemyUserRepository(UserRepository):
     """SQLAlchemy implementation of UserRepository."""
@@ -36,7 +53,22 @@ class SQLAlchemyUserRepository(UserRepository):
         
         async with self.db.get_session() as session:
             session.add(user_model)
-            await session.flush()
+            try:
+                await session.flush()
+            except IntegrityError:
+                # Unique constraint hit; find out which column collided in one query
+                await session.rollback()
+                result = await session.execute(
+                    select(UserModel.username, UserModel.email).where(
+                        or_(UserModel.username == user.username, UserModel.email == user.email)
+                    )
+                )
+                rows = result.all()
+                if any(row.username == user.username for row in rows):
+                    raise UserAlreadyExists(user.username)
+                if any(row.email == user.email for row in rows):
+                    raise EmailAlreadyExists(user.email)
+                raise
             
             # Add roles if any
             if user.roles:
@@ -54,24 +86,81 @@ class SQLAlchemyUserRepository(UserRepository):
             # Convert back to domain entity
             return self._model_to_entity(user_model)
     
+    async def create_many(self, users: List[User]) -> List[User]:
+        """Create multiple users in a single batch."""
+        user_models = [
+            UserModel(
+                id=user.id,
+                username=user.username,
+                email=user.email,
+                hashed_password=user.hashed_password,
+                full_name=user.full_name,
+                is_active=user.is_active,
+                is_superuser=user.is_superuser,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
+            for user in users
+        ]
+        
+        async with self.db.get_session() as session:
+            session.add_all(user_models)
+            try:
+                await session.flush()
+            except IntegrityError:
+                # Unique constraint hit; find out which username or email collided in one query
+                await session.rollback()
+                usernames = [user.username for user in users]
+                emails = [user.email for user in users]
+                result = await session.execute(
+                    select(UserModel.username, UserModel.email).where(
+                        or_(UserModel.username.in_(usernames), UserModel.email.in_(emails))
+                    )
+                )
+                rows = result.all()
+                taken_usernames = {row.username for row in rows}
+                taken_emails = {row.email for row in rows}
+                
+                # Otherwise the batch collided with itself
+                seen_usernames, seen_emails = set(), set()
+                for user in users:
+                    if user.username in taken_usernames or user.username in seen_usernames:
+                        raise UserAlreadyExists(user.username)
+                    if user.email in taken_emails or user.email in seen_emails:
+                        raise EmailAlreadyExists(user.email)
+                    seen_usernames.add(user.username)
+                    seen_emails.add(user.email)
+                raise
+            
+            await session.commit()
+        
+        return users
+    
     async def get_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """Get user by ID."""
+        key = ("user", user_id)
+        cached = get_cached(key)
+        if cached:
+            return cached
+        
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+                select(UserModel).options(selectinload(UserModel.roles)).where(UserModel.id == user_id)
             )
             user_model = result.scalar_one_or_none()
             
             if not user_model:
                 return None
             
-            return self._model_to_entity(user_model)
+            user = self._model_to_entity(user_model)
+            store(key, user)
+            return user
     
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(UserModel).where(UserModel.username == username)
+                select(UserModel).options(selectinload(UserModel.roles)).where(UserModel.username == username)
             )
             user_model = result.scalar_one_or_none()
             
@@ -84,7 +173,7 @@ class SQLAlchemyUserRepository(UserRepository):
         """Get user by email."""
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(UserModel).where(UserModel.email == email)
+                select(UserModel).options(selectinload(UserModel.roles)).where(UserModel.email == email)
             )
             user_model = result.scalar_one_or_none()
             
@@ -93,6 +182,23 @@ class SQLAlchemyUserRepository(UserRepository):
             
             return self._model_to_entity(user_model)
     
+    async def get_by_username_or_email(self, identifier: str) -> Optional[User]:
+        """Get user by username, or by email if no username matches."""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(UserModel).options(selectinload(UserModel.roles)).where(
+                    or_(UserModel.username == identifier, UserModel.email == identifier)
+                )
+            )
+            user_models = result.scalars().all()
+            
+            if not user_models:
+                return None
+            
+            # One user's username may equal another's email; the username wins, as before
+            user_model = next((model for model in user_models if model.username == identifier), user_models[0])
+            return self._model_to_entity(user_model)
+    
     async def update(self, user: User) -> User:
         """Update an existing user."""
         async with self.db.get_session() as session:
@@ -102,7 +208,7 @@ class SQLAlchemyUserRepository(UserRepository):
             user_model = result.scalar_one_or_none()
             
             if not user_model:
-                raise ValueError(f"User with ID {user.id} not found")
+                raise UserNotFound(user.id)
             
             # Update fields
             user_model.username = user.username
@@ -130,10 +236,13 @@ class SQLAlchemyUserRepository(UserRepository):
             await session.commit()
             await session.refresh(user_model)
             
-            return self._model_to_entity(user_model)
+            updated = self._model_to_entity(user_model)
+            store(("user", updated.id), updated)
+            return updated
     
     async def delete(self, user_id: uuid.UUID) -> bool:
         """Delete a user."""
+        evict(("user", user_id))
         async with self.db.get_session() as session:
             result = await session.execute(
                 delete(UserModel).where(UserModel.id == user_id)
@@ -145,57 +254,83 @@ class SQLAlchemyUserRepository(UserRepository):
         """List users with pagination."""
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(UserModel).offset(skip).limit(limit)
+                select(UserModel).options(selectinload(UserModel.roles)).offset(skip).limit(limit)
             )
             user_models = result.scalars().all()
             
             return [self._model_to_entity(user_model) for user_model in user_models]
     
-    async def add_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> UserRole:
-        """Add a role to a user."""
+    async def add_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> User:
+        """Add a role to a user and return the updated user."""
         async with self.db.get_session() as session:
-            user_result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+            # One query for both rows, with the current roles loaded for the update
+            result = await session.execute(
+                select(UserModel, RoleModel)
+                .outerjoin(RoleModel, RoleModel.id == role_id)
+                .where(UserModel.id == user_id)
+                .options(selectinload(UserModel.roles))
             )
-            user_model = user_result.scalar_one_or_none()
+            row = result.first()
             
-            if not user_model:
-                raise ValueError(f"User with ID {user_id} not found")
+            if not row:
+                raise UserNotFound(user_id)
             
-            role_result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
-            )
-            role_model = role_result.scalar_one_or_none()
+            user_model, role_model = row
             
             if not role_model:
-                raise ValueError(f"Role with ID {role_id} not found")
+                raise RoleNotFound(role_id)
             
             user_model.roles.append(role_model)
+            # Build the entity before commit, which expires every loaded attribute
+            updated = self._model_to_entity(user_model)
             await session.commit()
             
-            return UserRole(user_id=user_id, role_id=role_id)
+            store(("user", user_id), updated)
+            return updated
+    
+    async def add_roles_bulk(self, pairs: List[Tuple[uuid.UUID, uuid.UUID]]) -> List[UserRole]:
+        """Add roles to users in a single batch of (user_id, role_id) pairs."""
+        if not pairs:
+            return []
+        
+        async with self.db.get_session() as session:
+            try:
+                await session.execute(
+                    insert(user_role_association),
+                    [{"user_id": user_id, "role_id": role_id} for user_id, role_id in pairs],
+                )
+            except IntegrityError:
+                raise ValueError("One or more users or roles not found, or already assigned")
+            
+            await session.commit()
+        
+        for user_id, _ in pairs:
+            evict(("user", user_id))
+        return [UserRole(user_id=user_id, role_id=role_id) for user_id, role_id in pairs]
     
     async def remove_role(self, user_id: uuid.UUID, role_id: uuid.UUID) -> bool:
         """Remove a role from a user."""
         async with self.db.get_session() as session:
-            user_result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+            # One query for both rows, with the current roles loaded for the update
+            result = await session.execute(
+                select(UserModel, RoleModel)
+                .outerjoin(RoleModel, RoleModel.id == role_id)
+                .where(UserModel.id == user_id)
+                .options(selectinload(UserModel.roles))
             )
-            user_model = user_result.scalar_one_or_none()
+            row = result.first()
             
-            if not user_model:
+            if not row:
                 return False
             
-            role_result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
-            )
-            role_model = role_result.scalar_one_or_none()
+            user_model, role_model = row
             
             if not role_model or role_model not in user_model.roles:
                 return False
             
             user_model.roles.remove(role_model)
             await session.commit()
+            evict(("user", user_id))
             
             return True
     
@@ -203,7 +338,7 @@ class SQLAlchemyUserRepository(UserRepository):
         """Get all roles for a user."""
         async with self.db.get_session() as session:
             user_result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+                select(UserModel).options(selectinload(UserModel.roles)).where(UserModel.id == user_id)
             )
             user_model = user_result.scalar_one_or_none()
             
@@ -221,6 +356,42 @@ class SQLAlchemyUserRepository(UserRepository):
                 for role in user_model.roles
             ]
     
+    async def get_roles_with_privileges(self, user_id: uuid.UUID) -> List[Role]:
+        """Get all roles for a user with their privileges loaded, in a single query."""
+        async with self.db.get_session() as session:
+            result = await session.execute(
+                select(RoleModel, PrivilegeModel)
+                .join(user_role_association, user_role_association.c.role_id == RoleModel.id)
+                .outerjoin(role_privilege_association, role_privilege_association.c.role_id == RoleModel.id)
+                .outerjoin(PrivilegeModel, PrivilegeModel.id == role_privilege_association.c.privilege_id)
+                .where(user_role_association.c.user_id == user_id)
+            )
+            
+            # One row per (role, privilege) pair; roles without privileges come back once with None
+            roles: Dict[uuid.UUID, Role] = {}
+            for role_model, privilege_model in result.all():
+                role = roles.get(role_model.id)
+                if role is None:
+                    role = roles[role_model.id] = Role(
+                        id=role_model.id,
+                        name=role_model.name,
+                        description=role_model.description,
+                        created_at=role_model.created_at,
+                        updated_at=role_model.updated_at,
+                    )
+                if privilege_model is not None:
+                    role.add_privilege(
+                        Privilege(
+                            id=privilege_model.id,
+                            name=privilege_model.name,
+                            description=privilege_model.description,
+                            created_at=privilege_model.created_at,
+                            updated_at=privilege_model.updated_at,
+                        )
+                    )
+            
+            return list(roles.values())
+    
     def _model_to_entity(self, model: UserModel) -> User:
         """Convert a UserModel to a User entity."""
         return User(
@@ -264,7 +435,10 @@ class SQLAlchemyRoleRepository(RoleRepository):
         
         async with self.db.get_session() as session:
             session.add(role_model)
-            await session.flush()
+            try:
+                await session.flush()
+            except IntegrityError:
+                raise RoleAlreadyExists(role.name)
             
             # Add privileges if any
             if role.privileges:
@@ -284,22 +458,29 @@ class SQLAlchemyRoleRepository(RoleRepository):
     
     async def get_by_id(self, role_id: uuid.UUID) -> Optional[Role]:
         """Get role by ID."""
+        key = ("role", role_id)
+        cached = get_cached(key)
+        if cached:
+            return cached
+        
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
+                select(RoleModel).options(selectinload(RoleModel.privileges)).where(RoleModel.id == role_id)
             )
             role_model = result.scalar_one_or_none()
             
             if not role_model:
                 return None
             
-            return self._model_to_entity(role_model)
+            role = self._model_to_entity(role_model)
+            store(key, role)
+            return role
     
     async def get_by_name(self, name: str) -> Optional[Role]:
         """Get role by name."""
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(RoleModel).where(RoleModel.name == name)
+                select(RoleModel).options(selectinload(RoleModel.privileges)).where(RoleModel.name == name)
             )
             role_model = result.scalar_one_or_none()
             
@@ -317,7 +498,7 @@ class SQLAlchemyRoleRepository(RoleRepository):
             role_model = result.scalar_one_or_none()
             
             if not role_model:
-                raise ValueError(f"Role with ID {role.id} not found")
+                raise RoleNotFound(role.id)
             
             # Update fields
             role_model.name = role.name
@@ -341,10 +522,13 @@ class SQLAlchemyRoleRepository(RoleRepository):
             await session.commit()
             await session.refresh(role_model)
             
-            return self._model_to_entity(role_model)
+            updated = self._model_to_entity(role_model)
+            store(("role", updated.id), updated)
+            return updated
     
     async def delete(self, role_id: uuid.UUID) -> bool:
         """Delete a role."""
+        evict(("role", role_id))
         async with self.db.get_session() as session:
             result = await session.execute(
                 delete(RoleModel).where(RoleModel.id == role_id)
@@ -356,57 +540,83 @@ class SQLAlchemyRoleRepository(RoleRepository):
         """List roles with pagination."""
         async with self.db.get_session() as session:
             result = await session.execute(
-                select(RoleModel).offset(skip).limit(limit)
+                select(RoleModel).options(selectinload(RoleModel.privileges)).offset(skip).limit(limit)
             )
             role_models = result.scalars().all()
             
             return [self._model_to_entity(role_model) for role_model in role_models]
     
-    async def add_privilege(self, role_id: uuid.UUID, privilege_id: uuid.UUID) -> RolePrivilege:
-        """Add a privilege to a role."""
+    async def add_privilege(self, role_id: uuid.UUID, privilege_id: uuid.UUID) -> Role:
+        """Add a privilege to a role and return the updated role."""
         async with self.db.get_session() as session:
-            role_result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
+            # One query for both rows, with the current privileges loaded for the update
+            result = await session.execute(
+                select(RoleModel, PrivilegeModel)
+                .outerjoin(PrivilegeModel, PrivilegeModel.id == privilege_id)
+                .where(RoleModel.id == role_id)
+                .options(selectinload(RoleModel.privileges))
             )
-            role_model = role_result.scalar_one_or_none()
+            row = result.first()
             
-            if not role_model:
-                raise ValueError(f"Role with ID {role_id} not found")
+            if not row:
+                raise RoleNotFound(role_id)
             
-            privilege_result = await session.execute(
-                select(PrivilegeModel).where(PrivilegeModel.id == privilege_id)
-            )
-            privilege_model = privilege_result.scalar_one_or_none()
+            role_model, privilege_model = row
             
             if not privilege_model:
-                raise ValueError(f"Privilege with ID {privilege_id} not found")
+                raise PrivilegeNotFound(privilege_id)
             
             role_model.privileges.append(privilege_model)
+            # Build the entity before commit, which expires every loaded attribute
+            updated = self._model_to_entity(role_model)
             await session.commit()
             
-            return RolePrivilege(role_id=role_id, privilege_id=privilege_id)
+            store(("role", role_id), updated)
+            return updated
+    
+    async def add_privileges_bulk(self, pairs: List[Tuple[uuid.UUID, uuid.UUID]]) -> List[RolePrivilege]:
+        """Add privileges to roles in a single batch of (role_id, privilege_id) pairs."""
+        if not pairs:
+            return []
+        
+        async with self.db.get_session() as session:
+            try:
+                await session.execute(
+                    insert(role_privilege_association),
+                    [{"role_id": role_id, "privilege_id": privilege_id} for role_id, privilege_id in pairs],
+                )
+            except IntegrityError:
+                raise ValueError("One or more roles or privileges not found, or already assigned")
+            
+            await session.commit()
+        
+        for role_id, _ in pairs:
+            evict(("role", role_id))
+        return [RolePrivilege(role_id=role_id, privilege_id=privilege_id) for role_id, privilege_id in pairs]
     
     async def remove_privilege(self, role_id: uuid.UUID, privilege_id: uuid.UUID) -> bool:
         """Remove a privilege from a role."""
         async with self.db.get_session() as session:
-            role_result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
+            # One query for both rows, with the current privileges loaded for the update
+            result = await session.execute(
+                select(RoleModel, PrivilegeModel)
+                .outerjoin(PrivilegeModel, PrivilegeModel.id == privilege_id)
+                .where(RoleModel.id == role_id)
+                .options(selectinload(RoleModel.privileges))
             )
-            role_model = role_result.scalar_one_or_none()
+            row = result.first()
             
-            if not role_model:
+            if not row:
                 return False
             
-            privilege_result = await session.execute(
-                select(PrivilegeModel).where(PrivilegeModel.id == privilege_id)
-            )
-            privilege_model = privilege_result.scalar_one_or_none()
+            role_model, privilege_model = row
             
             if not privilege_model or privilege_model not in role_model.privileges:
                 return False
             
             role_model.privileges.remove(privilege_model)
             await session.commit()
+            evict(("role", role_id))
             
             return True
     
@@ -414,7 +624,7 @@ class SQLAlchemyRoleRepository(RoleRepository):
         """Get all privileges for a role."""
         async with self.db.get_session() as session:
             role_result = await session.execute(
-                select(RoleModel).where(RoleModel.id == role_id)
+                select(RoleModel).options(selectinload(RoleModel.privileges)).where(RoleModel.id == role_id)
             )
             role_model = role_result.scalar_one_or_none()
             
@@ -471,6 +681,11 @@ class SQLAlchemyPrivilegeRepository(PrivilegeRepository):
         
         async with self.db.get_session() as session:
             session.add(privilege_model)
+            try:
+                await session.flush()
+            except IntegrityError:
+                raise PrivilegeAlreadyExists(privilege.name)
+            
             await session.commit()
             await session.refresh(privilege_model)
             
@@ -479,6 +694,11 @@ class SQLAlchemyPrivilegeRepository(PrivilegeRepository):
     
     async def get_by_id(self, privilege_id: uuid.UUID) -> Optional[Privilege]:
         """Get privilege by ID."""
+        key = ("privilege", privilege_id)
+        cached = get_cached(key)
+        if cached:
+            return cached
+        
         async with self.db.get_session() as session:
             result = await session.execute(
                 select(PrivilegeModel).where(PrivilegeModel.id == privilege_id)
@@ -488,7 +708,9 @@ class SQLAlchemyPrivilegeRepository(PrivilegeRepository):
             if not privilege_model:
                 return None
             
-            return self._model_to_entity(privilege_model)
+            privilege = self._model_to_entity(privilege_model)
+            store(key, privilege)
+            return privilege
     
     async def get_by_name(self, name: str) -> Optional[Privilege]:
         """Get privilege by name."""
@@ -512,7 +734,7 @@ class SQLAlchemyPrivilegeRepository(PrivilegeRepository):
             privilege_model = result.scalar_one_or_none()
             
             if not privilege_model:
-                raise ValueError(f"Privilege with ID {privilege.id} not found")
+                raise PrivilegeNotFound(privilege.id)
             
             # Update fields
             privilege_model.name = privilege.name
@@ -522,10 +744,13 @@ class SQLAlchemyPrivilegeRepository(PrivilegeRepository):
             await session.commit()
             await session.refresh(privilege_model)
             
-            return self._model_to_entity(privilege_model)
+            updated = self._model_to_entity(privilege_model)
+            store(("privilege", updated.id), updated)
+            return updated
     
     async def delete(self, privilege_id: uuid.UUID) -> bool:
         """Delete a privilege."""
+        evict(("privilege", privilege_id))
         async with self.db.get_session() as session:
             result = await session.execute(
                 delete(PrivilegeModel).where(PrivilegeModel.id == privilege_id)
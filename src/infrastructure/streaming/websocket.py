@@ -58,7 +58,7 @@ class WebSocketManager:
     async def connect(self, websocket: WebSocket, user: User) -> None:
         """Accept a WebSocket connection."""
         await websocket.accept()
-        user_id = str(user.id)
+        user_id = user.id_str
         self.active_connections[user_id] = websocket
         self.user_subscriptions[user_id] = set()
         
@@ -87,7 +87,7 @@ class WebSocketManager:
     
     async def handle_message(self, websocket: WebSocket, user: User, message: str) -> None:
         """Handle incoming WebSocket message."""
-        user_id = str(user.id)
+        user_id = user.id_str
         
         try:
             # Parse request
@@ -116,7 +116,7 @@ class WebSocketManager:
     
     async def handle_subscribe(self, websocket: WebSocket, user: User, request: StreamingRequest) -> None:
         """Handle subscribe operation."""
-        user_id = str(user.id)
+        user_id = user.id_str
         topic = request.topic
         
         # Check if user has permission to subscribe to this topic
@@ -146,7 +146,7 @@ class WebSocketManager:
     
     async def handle_unsubscribe(self, websocket: WebSocket, user: User, request: StreamingRequest) -> None:
         """Handle unsubscribe operation."""
-        user_id = str(user.id)
+        user_id = user.id_str
         topic = request.topic
         
         # Remove from user subscriptions
@@ -168,7 +168,7 @@ class WebSocketManager:
     
     async def handle_publish(self, websocket: WebSocket, user: User, request: StreamingRequest) -> None:
         """Handle publish operation."""
-        user_id = str(user.id)
+        user_id = user.id_str
         topic = request.topic
         data = request.data or {}
         
@@ -177,7 +177,7 @@ class WebSocketManager:
             raise StreamingError("PERMISSION_DENIED", f"No permission to publish to topic: {topic}")
         
         # Add user info to data
-        data["user_id"] = str(user.id)
+        data["user_id"] = user.id_str
         data["username"] = user.username
         
         # Publish to streaming service
@@ -201,7 +201,7 @@ class WebSocketManager:
     
     async def subscription_task(self, user: User, topic: str) -> None:
         """Task to handle subscription to a topic and forward messages to WebSocket."""
-        user_id = str(user.id)
+        user_id = user.id_str
         
         try:
             async for message in self.streaming_service.subscribe(topic):
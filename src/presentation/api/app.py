@@ -1,9 +1,12 @@
 """
 Main FastAPI application setup.
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.domain.services.auth import TokenService
+from src.infrastructure.persistence.identity_map import begin_request_scope, end_request_scope
+from src.presentation.api.dependencies import get_token_service
 from src.presentation.api.v1.api import api_router
 
 def create_app() -> FastAPI:
@@ -23,6 +26,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Give each request its own identity map for repository lookups
+    @app.middleware("http")
+    async def identity_map_scope(request: Request, call_next):
+        token = begin_request_scope()
+        try:
+            return await call_next(request)
+        finally:
+            end_request_scope(token)
+    
     # Include API router
     app.include_router(api_router, prefix="/api/v1")
     
@@ -31,6 +43,11 @@ def create_app() -> FastAPI:
         """Root endpoint."""
         return {"message": "Welcome to the FastAPI application"}
     
+    @app.get("/.well-known/jwks.json")
+    def jwks(token_service: TokenService = Depends(get_token_service)):
+        """Public keys for verifying issued tokens."""
+        return token_service.get_jwks()
+    
     return app
 
 app = create_app()
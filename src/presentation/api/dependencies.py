@@ -1,11 +1,14 @@
 """
 API dependencies for authentication.
 """
+from functools import lru_cache
 from typing import Generator, Optional
+import os
 import uuid
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from redis.asyncio import Redis
 
 from src.domain.entities import User
 from src.domain.repositories.auth import UserRepository, RoleRepository, PrivilegeRepository
@@ -31,8 +34,9 @@ from src.infrastructure.auth import (
     PasswordServiceImpl,
     TokenServiceImpl,
     AuthServiceImpl,
+    CachedAuthService,
 )
-from src.infrastructure.config import DatabaseConfig, JWTConfig
+from src.infrastructure.config import DatabaseConfig, JWTConfig, CacheConfig
 
 # OAuth2 token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
@@ -47,10 +51,19 @@ def get_jwt_config() -> JWTConfig:
     return JWTConfig.from_env()
 
 # Database
+@lru_cache()
 def get_db() -> AsyncDatabase:
-    """Get database connection."""
+    """Get the process-wide database connection pool."""
     return AsyncDatabase(get_db_config())
 
+# Cache
+@lru_cache()
+def get_cache() -> Optional[Redis]:
+    """Get the process-wide DragonFlyDB client, or None if no cache is configured."""
+    if not os.getenv("DRAGONFLY_HOST"):
+        return None
+    return Redis(**CacheConfig.from_env().to_dict())
+
 # Repositories
 def get_user_repository(db: AsyncDatabase = Depends(get_db)) -> UserRepository:
     """Get user repository."""
@@ -69,12 +82,16 @@ def get_password_service() -> PasswordService:
     """Get password service."""
     return PasswordServiceImpl()
 
-def get_token_service(jwt_config: JWTConfig = Depends(get_jwt_config)) -> TokenService:
-    """Get token service."""
+@lru_cache()
+def get_token_service() -> TokenService:
+    """Get the process-wide token service, so its signing key is loaded once."""
+    jwt_config = get_jwt_config()
     return TokenServiceImpl(
         secret_key=jwt_config.secret_key,
         algorithm=jwt_config.algorithm,
         access_token_expire_minutes=jwt_config.access_token_expire_minutes,
+        private_key=jwt_config.private_key,
+        refresh_token_expire_days=jwt_config.refresh_token_expire_days,
     )
 
 def get_auth_service(
@@ -83,15 +100,19 @@ def get_auth_service(
     privilege_repository: PrivilegeRepository = Depends(get_privilege_repository),
     password_service: PasswordService = Depends(get_password_service),
     token_service: TokenService = Depends(get_token_service),
+    cache: Optional[Redis] = Depends(get_cache),
 ) -> AuthService:
     """Get authentication service."""
-    return AuthServiceImpl(
+    auth_service = AuthServiceImpl(
         user_repository=user_repository,
         role_repository=role_repository,
         privilege_repository=privilege_repository,
         password_service=password_service,
         token_service=token_service,
     )
+    if cache is None:
+        return auth_service
+    return CachedAuthService(auth_service, user_repository, cache)
 
 # Use cases
 def get_register_user_use_case(
@@ -151,21 +172,25 @@ def get_create_privilege_use_case(
 def get_assign_role_to_user_use_case(
     user_repository: UserRepository = Depends(get_user_repository),
     role_repository: RoleRepository = Depends(get_role_repository),
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> AssignRoleToUserUseCase:
     """Get assign role to user use case."""
     return AssignRoleToUserUseCase(
         user_repository=user_repository,
         role_repository=role_repository,
+        auth_service=auth_service,
     )
 
 def get_assign_privilege_to_role_use_case(
     role_repository: RoleRepository = Depends(get_role_repository),
     privilege_repository: PrivilegeRepository = Depends(get_privilege_repository),
+    auth_service: AuthService = Depends(get_auth_service),
 ) -> AssignPrivilegeToRoleUseCase:
     """Get assign privilege to role use case."""
     return AssignPrivilegeToRoleUseCase(
         role_repository=role_repository,
         privilege_repository=privilege_repository,
+        auth_service=auth_service,
     )
 
 def get_check_user_privilege_use_case(
@@ -3,6 +3,7 @@ API endpoints for authentication.
 """
 from typing import List, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from src.domain.entities import User
@@ -72,7 +73,7 @@ async def register_user(
         )
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, response_class=ORJSONResponse)
 async def login(
     login_data: LoginRequest,
     login_user_use_case: LoginUserUseCase = Depends(get_login_user_use_case),
@@ -91,7 +92,7 @@ async def login(
     return result
 
 
-@router.post("/token", response_model=Token)
+@router.post("/token", response_model=Token, response_class=ORJSONResponse)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     login_user_use_case: LoginUserUseCase = Depends(get_login_user_use_case),
@@ -110,7 +111,7 @@ async def login_for_access_token(
     return result
 
 
-@router.post("/refresh", response_model=Token)
+@router.post("/refresh", response_model=Token, response_class=ORJSONResponse)
 async def refresh_token(
     refresh_token_data: RefreshToken,
     refresh_token_use_case: RefreshTokenUseCase = Depends(get_refresh_token_use_case),
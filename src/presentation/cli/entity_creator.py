@@ -4,15 +4,11 @@ Terminal command for adding new entities with CRUD operations.
 import os
 import typer
 from typing import Optional, List, Dict, Any
-import inflect
 import json
 
 from src.application.use_cases.model_generator import ModelField, ModelRelationship, Model, ModelGenerator
 from src.application.use_cases.crud_generator import CRUDGenerator
 
-# Initialize inflect engine for pluralization
-p = inflect.engine()
-
 app = typer.Typer(help="Entity Creator - Add new entities with CRUD operations to an existing project")
 
 @app.command()